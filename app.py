@@ -2,12 +2,15 @@ from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import Optional
+import logging
 import uvicorn
 import os
 from property_data import get_enhanced_parcel_data, format_property_data_for_llm
 from src.llm import get_similar_developments, get_estate_development_opportunities, get_estate_report
 from prompts import DEVELOPMENT_OPPORTUNITIES_PROMPT
 
+logger = logging.getLogger(__name__)
+
 app = FastAPI(title="PlotTwist API - Backend", 
               description="Backend API for real estate development opportunity analysis")
 
@@ -36,17 +39,14 @@ class PropertyResponse(BaseModel):
 @app.post("/create-report", response_model=PropertyResponse)
 async def create_report(request: PropertyRequest):
     enhanced_parcel_data = get_enhanced_parcel_data("", request.street_number, request.street_name, request.street_suffix, request.unit_number)
-    print(enhanced_parcel_data)
+    logger.debug("Parcel data: %s", enhanced_parcel_data)
     formatted_property_info = format_property_data_for_llm(enhanced_parcel_data)
     recent_developments = get_similar_developments(formatted_property_info)
-    print("="*100)
-    print(recent_developments)
+    logger.debug("Recent developments: %s", recent_developments)
     development_opportunities = get_estate_development_opportunities(formatted_property_info, recent_developments["content"])
-    print("="*100)
-    print(development_opportunities)
+    logger.debug("Development opportunities: %s", development_opportunities)
     report = get_estate_report(formatted_property_info, development_opportunities)
-    print("="*100)
-    print(report)
+    logger.debug("Final report: %s", report)
     return PropertyResponse(
         final_report=report,
         recent_developments=recent_developments["content"],
@@ -1,21 +1,39 @@
 from __future__ import annotations
 
 import csv
+import os
 import time
 import asyncio
 import sys
 from dataclasses import dataclass
-from typing import List, Optional, Dict
+from math import radians, sin, cos, sqrt, asin
+from typing import Callable, List, Optional, Dict
 from urllib.parse import urljoin, urlencode
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
 
+import numpy as np
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import aiohttp
 from bs4 import BeautifulSoup
-import json
-
-
-@dataclass
+import orjson
+
+from zoning_scraper import (
+    ARCGIS_WORLD_PARAMS,
+    ARCGIS_WORLD_URL,
+    BOSTON_ARCGIS_PARAMS,
+    BOSTON_ARCGIS_URL,
+    GEOCODER_LIMITERS,
+    NOMINATIM_HEADERS,
+    NOMINATIM_PARAMS,
+    NOMINATIM_URL,
+    RateLimiter,
+    first_result,
+)
+
+
+@dataclass(slots=True)
 class Development:
     address: str
     link: str
@@ -24,19 +42,33 @@ class Development:
     distance: float = 0.0
 
 
+# Radius of Earth in miles
+EARTH_RADIUS_MILES = 3958.8
+
+# How many developments go in closest_developments.md, and how many candidates
+# survive the equirectangular pre-filter to get an exact distance (~200 + 10% margin)
+NUM_CLOSEST = 30
+PREFILTER_CANDIDATES = 220
+
 BASE = "https://www.bostonplans.org"
 LIST_URL = f"{BASE}/projects/development-projects"
 
+
+# Listing page markup: primary cards, then the generic project-link fallback
+PROJECT_WRAPPER_CLASS = "projectTableWrapper"
+PROJECT_CARD_CLASS = "devprojectTable"
+PROJECT_LINK_SELECTOR = 'a[href*="/projects/development-projects/"]'
+
+
+def normalize_address(address: str) -> str:
+    """Key used to treat trivially different spellings of an address as one."""
+    return " ".join(address.split()).lower()
+
 def haversine_distance_miles(lat1, lon1, lat2, lon2):
     """
     Calculate the great-circle distance between two points on the Earth (specified in decimal degrees).
     Returns distance in miles.
     """
-    from math import radians, sin, cos, sqrt, atan2
-
-    # Radius of Earth in miles
-    R = 3958.8
-
     # Convert decimal degrees to radians
     lat1_rad, lon1_rad = radians(lat1), radians(lon1)
     lat2_rad, lon2_rad = radians(lat2), radians(lon2)
@@ -46,58 +78,106 @@ def haversine_distance_miles(lat1, lon1, lat2, lon2):
     dlon = lon2_rad - lon1_rad
 
     a = sin(dlat / 2) ** 2 + cos(lat1_rad) * cos(lat2_rad) * sin(dlon / 2) ** 2
-    c = 2 * atan2(sqrt(a), sqrt(1 - a))
+    # 2*asin(sqrt(a)) == 2*atan2(sqrt(a), sqrt(1-a)) with one sqrt fewer;
+    # clamp guards against rounding just past 1 for antipodal points
+    c = 2 * asin(sqrt(min(a, 1.0)))
 
-    distance = R * c
+    distance = EARTH_RADIUS_MILES * c
     return distance
 
 
+def haversine_vec(lats, lons, lat0, lon0):
+    """
+    Vectorized haversine: distance in miles from (lat0, lon0) to every point
+    in the `lats`/`lons` arrays (decimal degrees). NaN coordinates yield NaN.
+    """
+    lat0_rad, lon0_rad = np.radians(lat0), np.radians(lon0)
+    lats_rad, lons_rad = np.radians(lats), np.radians(lons)
+
+    dlat = lats_rad - lat0_rad
+    dlon = lons_rad - lon0_rad
+
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat0_rad) * np.cos(lats_rad) * np.sin(dlon / 2) ** 2
+    c = 2 * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+    return EARTH_RADIUS_MILES * c
+
+
+def nearest_distances(lats, lons, lat0, lon0, k):
+    """
+    Haversine distances from (lat0, lon0), computed exactly only for the `k`
+    candidates closest by the cheap equirectangular approximation; every
+    other point (and any NaN coordinate) gets +inf.
+    """
+    dists = np.full(len(lats), np.inf)
+    if len(lats) == 0:
+        return dists
+
+    # Equirectangular approximation in degrees; cos(lat) is near-constant
+    # across Boston, so its ordering matches haversine closely
+    approx = np.hypot((lons - lon0) * np.cos(np.radians(lat0)), lats - lat0)
+    approx[np.isnan(approx)] = np.inf
+    if k < len(approx):
+        candidates = np.argpartition(approx, k)[:k]
+    else:
+        candidates = np.arange(len(approx))
+
+    dists[candidates] = haversine_vec(lats[candidates], lons[candidates], lat0, lon0)
+    dists[np.isnan(dists)] = np.inf
+    return dists
+
+
 # ========== ASYNC GEOCODING FUNCTIONS ==========
 
-async def geocode_boston_address_async(address: str) -> Optional[Dict]:
+# Nominatim's usage policy allows at most 1 request/second; ArcGIS tolerates far more.
+# The Nominatim limiter is zoning_scraper's, so both modules together stay within it
+ARCGIS_WORLD_LIMITER = RateLimiter(20)
+BOSTON_ARCGIS_LIMITER = RateLimiter(20)
+NOMINATIM_LIMITER = GEOCODER_LIMITERS["nominatim"]
+
+def new_geocoding_session() -> aiohttp.ClientSession:
     """
-    Asynchronous version of geocoding that makes concurrent requests to all services.
-    Much faster than the sequential version.
+    Session meant to be shared across a whole geocoding run, so keep-alive
+    connections to the geocoder hosts are reused between addresses. Hosts
+    are resolved with aiodns and cached, instead of a blocking
+    getaddrinfo call in the default executor. Must be called from a
+    running event loop.
     """
-    async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=30)) as session:
-        # Create tasks for all geocoding methods
-        tasks = [
-            _geocode_with_arcgis_world_async(session, address),
-            _geocode_with_boston_arcgis_async(session, address),
-            _geocode_with_nominatim_async(session, address)
-        ]
-        
-        # Wait for the first successful result
-        for completed_task in asyncio.as_completed(tasks):
-            try:
-                result = await completed_task
-                if result:
-                    return {
-                        'latitude': result['y'],
-                        'longitude': result['x'],
-                        'score': result['score'],
-                        'address': result['address'],
-                        'method': result.get('method', 'unknown')
-                    }
-            except Exception as e:
-                continue
-        
+    return aiohttp.ClientSession(
+        timeout=aiohttp.ClientTimeout(total=30),
+        connector=aiohttp.TCPConnector(limit=32, limit_per_host=8, ttl_dns_cache=600,
+                                       resolver=aiohttp.AsyncResolver()),
+    )
+
+async def geocode_boston_address_async(session: aiohttp.ClientSession, address: str) -> Optional[Dict]:
+    """
+    Asynchronous version of geocoding: races the ArcGIS services and falls
+    back to Nominatim, in the same order as zoning_scraper's RACED_GEOCODERS
+    and FALLBACK_GEOCODERS.
+    """
+    _, result = await first_result({
+        asyncio.create_task(_geocode_with_arcgis_world_async(session, address)): 'arcgis_world',
+        asyncio.create_task(_geocode_with_boston_arcgis_async(session, address)): 'boston_arcgis',
+    })
+    if not result:
+        result = await _geocode_with_nominatim_async(session, address)
+    if not result:
         return None
 
+    return {
+        'latitude': result['y'],
+        'longitude': result['x'],
+        'score': result['score'],
+        'address': result['address'],
+        'method': result.get('method', 'unknown')
+    }
+
 async def _geocode_with_arcgis_world_async(session: aiohttp.ClientSession, address: str) -> Optional[Dict]:
     """Async version of ArcGIS World geocoding"""
     try:
-        geocode_url = "https://geocode-api.arcgis.com/arcgis/rest/services/World/GeocodeServer/findAddressCandidates"
-        params = {
-            'SingleLine': address,
-            'f': 'json',
-            'outSR': '4326',
-            'maxLocations': 1,
-            'category': 'Address',
-            'countryCode': 'USA'
-        }
+        params = {**ARCGIS_WORLD_PARAMS, 'SingleLine': address}
         
-        async with session.get(geocode_url, params=params) as response:
+        async with ARCGIS_WORLD_LIMITER, session.get(ARCGIS_WORLD_URL, params=params) as response:
             data = await response.json()
             
             if data.get('candidates') and len(data['candidates']) > 0:
@@ -117,15 +197,9 @@ async def _geocode_with_arcgis_world_async(session: aiohttp.ClientSession, addre
 async def _geocode_with_boston_arcgis_async(session: aiohttp.ClientSession, address: str) -> Optional[Dict]:
     """Async version of Boston ArcGIS geocoding"""
     try:
-        geocode_url = "https://services.arcgis.com/sFnw0xNflSi8J0qw/arcgis/rest/services/Boston_Composite_Locator/GeocodeServer/findAddressCandidates"
-        params = {
-            'SingleLine': address,
-            'f': 'json',
-            'outSR': '4326',
-            'maxLocations': 1
-        }
+        params = {**BOSTON_ARCGIS_PARAMS, 'SingleLine': address}
         
-        async with session.get(geocode_url, params=params) as response:
+        async with BOSTON_ARCGIS_LIMITER, session.get(BOSTON_ARCGIS_URL, params=params) as response:
             data = await response.json()
             
             if data.get('candidates') and len(data['candidates']) > 0:
@@ -145,18 +219,9 @@ async def _geocode_with_boston_arcgis_async(session: aiohttp.ClientSession, addr
 async def _geocode_with_nominatim_async(session: aiohttp.ClientSession, address: str) -> Optional[Dict]:
     """Async version of Nominatim geocoding"""
     try:
-        geocode_url = "https://nominatim.openstreetmap.org/search"
-        params = {
-            'q': address,
-            'format': 'json',
-            'limit': 1,
-            'countrycodes': 'us',
-            'bounded': 1,
-            'viewbox': '-71.191155,42.227925,-70.986365,42.400819'
-        }
-        headers = {'User-Agent': 'BostonZoningTool/1.0'}
+        params = {**NOMINATIM_PARAMS, 'q': address}
         
-        async with session.get(geocode_url, params=params, headers=headers) as response:
+        async with NOMINATIM_LIMITER, session.get(NOMINATIM_URL, params=params, headers=NOMINATIM_HEADERS) as response:
             data = await response.json()
             
             if data and len(data) > 0:
@@ -174,38 +239,44 @@ async def _geocode_with_nominatim_async(session: aiohttp.ClientSession, address:
 
 # ========== BATCH GEOCODING FUNCTIONS ==========
 
-async def geocode_addresses_batch_async(developments: List[Development], batch_size: int = 10) -> List[Optional[Dict]]:
+async def geocode_addresses_batch_async(developments: List[Development], batch_size: int = 10,
+                                        session: Optional[aiohttp.ClientSession] = None,
+                                        on_result: Optional[Callable[[Development, Optional[Dict]], None]] = None
+                                        ) -> List[Optional[Dict]]:
     """
     Asynchronous batch geocoding with controlled concurrency.
     Most efficient for large numbers of addresses.
     
     Args:
         addresses: List of address strings
-        batch_size: Number of addresses to process concurrently
+        batch_size: Maximum number of addresses geocoded at the same time
+        session: Shared session to geocode with; one is opened for the batch if omitted
+        on_result: Called with (development, result) as each address finishes, in completion order
     
     Returns:
         List of results, one per address (None if geocoding failed)
     """
+    if session is None:
+        async with new_geocoding_session() as session:
+            return await geocode_addresses_batch_async(developments, batch_size, session, on_result)
+
     results = [None] * len(developments)
-    
-    # Process in batches to avoid overwhelming the APIs
-    for i in range(0, len(developments), batch_size):
-        batch = developments[i:i + batch_size]
-        batch_tasks = [geocode_boston_address_async(d.address) for d in batch]
-        
-        batch_results = await asyncio.gather(*batch_tasks, return_exceptions=True)
-        
-        # Store results
-        for j, result in enumerate(batch_results):
-            if isinstance(result, Exception):
-                print(f"Geocoding failed for address at index {i+j}: {result}")
-                results[i + j] = None
-            else:
-                results[i + j] = result
-        
-        # Small delay between batches to be respectful to APIs
-        if i + batch_size < len(developments):
-            await asyncio.sleep(0.1)
+    sem = asyncio.Semaphore(batch_size)
+
+    async def worker(i: int, d: Development):
+        async with sem:
+            try:
+                return i, await geocode_boston_address_async(session, d.address)
+            except Exception as e:
+                print(f"Geocoding failed for address at index {i}: {e}")
+                return i, None
+
+    # A slow address only holds its own slot; results are handled as soon as they land
+    for next_done in asyncio.as_completed([worker(i, d) for i, d in enumerate(developments)]):
+        i, result = await next_done
+        results[i] = result
+        if on_result:
+            on_result(developments[i], result)
     
     return results
 
@@ -215,23 +286,23 @@ def parse_list_page(html: str, base_url: str) -> List[Development]:
     Parse one listing page. Tries the classes you observed first,
     then falls back to a generic selector for project links.
     """
-    soup = BeautifulSoup(html, "html.parser")
+    soup = BeautifulSoup(html, "lxml")
     devs: List[Development] = []
 
     # 1) Primary path: your observed DOM
-    wrapper = soup.find("div", class_="projectTableWrapper")
+    wrapper = soup.find("div", class_=PROJECT_WRAPPER_CLASS)
     if wrapper:
-        for card in wrapper.find_all("div", class_="devprojectTable"):
+        for card in wrapper.find_all("div", class_=PROJECT_CARD_CLASS):
             a = card.find("a", href=True)
             if a:
                 address = a.get_text(strip=True)
                 link = urljoin(base_url, a["href"])
                 if address and "/projects/development-projects" in link:
-                    devs.append(Development(address=address, link=link))
+                    devs.append(Development(address=address, link=link, latitude=float('nan'), longitude=float('nan')))
     # 2) Fallback path: any project links in the list view
     if not devs:
         # These anchors are the project entries (their text is often the address)
-        for a in soup.select('a[href*="/projects/development-projects/"]'):
+        for a in soup.select(PROJECT_LINK_SELECTOR):
             text = a.get_text(strip=True)
             href = a.get("href", "")
             if not text or not href:
@@ -242,40 +313,72 @@ def parse_list_page(html: str, base_url: str) -> List[Development]:
             link = urljoin(base_url, href)
             devs.append(Development(address=text, link=link, latitude=float('nan'), longitude=float('nan')))
 
-        # Deduplicate by link
-        seen = set()
-        unique = []
-        for d in devs:
-            if d.link not in seen:
-                seen.add(d.link)
-                unique.append(d)
-        devs = unique
+    # Deduplicate by link (both paths can list the same project twice)
+    seen = set()
+    unique = []
+    for d in devs:
+        if d.link not in seen:
+            seen.add(d.link)
+            unique.append(d)
+    devs = unique
 
     return devs
 
 
+def load_cached_developments(path: str = "cached-developments.json"):
+    """
+    Load the development geocode cache in column form: the raw entries, an
+    address -> row index, and parallel float64 latitude/longitude arrays.
+    """
+    with open(path, "rb") as f:
+        entries = orjson.loads(f.read())
+    index = {}
+    for row, c in enumerate(entries):
+        index.setdefault(c["address"], row)
+    lats = np.fromiter((c["latitude"] for c in entries), dtype=np.float64, count=len(entries))
+    lons = np.fromiter((c["longitude"] for c in entries), dtype=np.float64, count=len(entries))
+    return entries, index, lats, lons
+
+
+# Friendly UA; helps some sites serve full HTML
+SCRAPER_USER_AGENT = ("Mozilla/5.0 (X11; Linux x86_64) "
+                      "AppleWebKit/537.36 (KHTML, like Gecko) "
+                      "Chrome/124.0.0.0 Safari/537.36")
+
+
+def listing_params(neighbordhood: Optional[str] = None) -> Dict[str, str]:
+    """Query parameters shared by every listing page, optionally filtered by neighborhood."""
+    params = {"sortby": "filed", "sortdirection": "DESC"}
+    if neighbordhood:
+        with open("neighborhood-id-mapping.json", "rb") as f:
+            neighborhood_id_mapping = orjson.loads(f.read())
+        params['neighborhoodid'] = neighborhood_id_mapping[neighbordhood.lower()]
+    return params
+
+
+def list_page_url(page: int, params: Dict[str, str]) -> str:
+    """Page 1 is the base URL (no ?page=), pages >= 2 use ?page=N."""
+    if page > 1:
+        params = {**params, "page": page}
+    return f"{LIST_URL}?{urlencode(params)}"
+
+
 def scrape_developments(num_pages: int = 100, delay_sec: float = 0.1, neighbordhood: Optional[str] = None) -> List[Development]:
     """
     Scrape up to `num_pages` pages of the Development Projects listing.
     Page 1 is the base URL (no ?page=), pages >= 2 use ?page=N.
     """
     session = requests.Session()
-    session.headers.update({
-        # Friendly UA; helps some sites serve full HTML
-        "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) "
-                      "AppleWebKit/537.36 (KHTML, like Gecko) "
-                      "Chrome/124.0.0.0 Safari/537.36"
-    })
+    session.headers.update({"User-Agent": SCRAPER_USER_AGENT})
+    # Retry transient failures instead of aborting the whole scrape, and keep the connection alive between pages
+    retry = Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+    session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=10, max_retries=retry))
 
     all_devs: List[Development] = []
-    with open("neighborhood-id-mapping.json", "r", encoding="utf-8") as f:
-        neighborhood_id_mapping = json.load(f)
-    params = {"sortby": "filed", "sortdirection": "DESC"}
-    if neighbordhood:
-        params['neighborhoodid'] = neighborhood_id_mapping[neighbordhood.lower()]
+    params = listing_params(neighbordhood)
     for page in range(1, num_pages + 1):
         # Construct URL with query parameters
-        url = f"{LIST_URL}?{urlencode(params)}"
+        url = list_page_url(page, params)
             
         resp = session.get(url, timeout=30)
         resp.raise_for_status()
@@ -289,82 +392,135 @@ def scrape_developments(num_pages: int = 100, delay_sec: float = 0.1, neighbordh
     return all_devs
 
 
+async def fetch_page(session: aiohttp.ClientSession, sem: asyncio.Semaphore, url: str, delay_sec: float = 0.1) -> str:
+    """Fetch one listing page, holding a semaphore slot so only a few requests are in flight."""
+    async with sem:
+        async with session.get(url) as resp:
+            resp.raise_for_status()
+            html = await resp.text()
+        await asyncio.sleep(delay_sec)  # be polite
+    return html
+
+
+async def scrape_developments_async(num_pages: int = 100, concurrency: int = 6, delay_sec: float = 0.1,
+                                    neighbordhood: Optional[str] = None) -> List[Development]:
+    """
+    Async version of scrape_developments: fetches up to `concurrency` listing
+    pages at a time instead of one after another.
+    """
+    params = listing_params(neighbordhood)
+    sem = asyncio.Semaphore(concurrency)
+    loop = asyncio.get_running_loop()
+
+    async def fetch_and_parse(session, executor, page):
+        html = await fetch_page(session, sem, list_page_url(page, params), delay_sec)
+        # Parsing is CPU-bound; run it in a worker process so the event loop keeps fetching
+        return await loop.run_in_executor(executor, parse_list_page, html, BASE)
+
+    with ProcessPoolExecutor(max_workers=max(1, min(num_pages, os.cpu_count() or 1))) as executor:
+        async with aiohttp.ClientSession(headers={"User-Agent": SCRAPER_USER_AGENT},
+                                         timeout=aiohttp.ClientTimeout(total=30)) as session:
+            parsed_pages = await asyncio.gather(*(
+                fetch_and_parse(session, executor, page)
+                for page in range(1, num_pages + 1)
+            ))
+
+    all_devs: List[Development] = []
+    for page, page_devs in enumerate(parsed_pages, start=1):
+        all_devs.extend(page_devs)
+        print(f"Page {page}: {len(page_devs)} items")
+
+    return all_devs
+
+
 async def main_async(target_address: str, neighbordhood: str):
-    print("Geocoding target address...")
-    target_result = await geocode_boston_address_async(target_address)
-    if not target_result:
-        print("Failed to geocode target address!")
-        return
+    # One session for the whole run so geocoder connections are kept alive
+    async with new_geocoding_session() as session:
+        print("Geocoding target address...")
+        target_result = await geocode_boston_address_async(session, target_address)
+        if not target_result:
+            print("Failed to geocode target address!")
+            return
         
-    print(f"Target coords: {target_result['latitude']}, {target_result['longitude']}")
-    
-    print("Scraping developments...")
-    developments = scrape_developments(num_pages=2, neighbordhood=neighbordhood)
-    print(f"Found {len(developments)} developments")
-
-    with open("cached-developments.json", "r", encoding="utf-8") as f:
-        cached_developments = json.load(f)
-    cached_addresses = [d["address"] for d in cached_developments]
-    # Extract addresses for batch geocoding
-    developments_to_geocode = [d for d in developments if d.address not in cached_addresses]
-    print(f"Geocoding {len(developments_to_geocode)} developments...")
-    geocoded_developments = [d for d in developments if d.address in cached_addresses]
-    for d in geocoded_developments:
-        for c in cached_developments:
-            if c["address"] == d.address:
-                d.latitude = c["latitude"]
-                d.longitude = c["longitude"]
-                d.distance = haversine_distance_miles(
-                    d.latitude, d.longitude, 
-                    target_result['latitude'], target_result['longitude']
-                )
-                break
+        print(f"Target coords: {target_result['latitude']}, {target_result['longitude']}")
     
-    print(f"Batch geocoding {len(developments_to_geocode)} addresses (async)...")
-    start_time = time.time()
-    geocode_results = await geocode_addresses_batch_async(developments_to_geocode, batch_size=10)
-    end_time = time.time()
+        print("Scraping developments...")
+        developments = await scrape_developments_async(num_pages=2, neighbordhood=neighbordhood)
+        print(f"Found {len(developments)} developments")
+
+        cached_developments, cache_index, cached_lats, cached_lons = load_cached_developments()
+        num_previously_cached = len(cached_developments)
+        # Extract addresses for batch geocoding
+        developments_to_geocode = [d for d in developments if d.address not in cache_index]
+        print(f"Geocoding {len(developments_to_geocode)} developments...")
+        geocoded_developments = [d for d in developments if d.address in cache_index]
+        for d in geocoded_developments:
+            row = cache_index[d.address]
+            d.latitude = float(cached_lats[row])
+            d.longitude = float(cached_lons[row])
     
-    print(f"Geocoded {len(developments_to_geocode)} addresses in {end_time - start_time:.2f} seconds")
+        # Geocode each distinct address once; duplicates get the same result below
+        duplicates_by_key = {}
+        for d in developments_to_geocode:
+            duplicates_by_key.setdefault(normalize_address(d.address), []).append(d)
+        unique_developments = [group[0] for group in duplicates_by_key.values()]
+
+        def record_result(dev: Development, result: Optional[Dict]):
+            # Single writer: results stream in here and go straight into the cache
+            for d in duplicates_by_key[normalize_address(dev.address)]:
+                if result:
+                    d.latitude = result['latitude']
+                    d.longitude = result['longitude']
+                    if d.address not in cache_index:
+                        cache_index[d.address] = len(cached_developments)
+                        cached_developments.append({
+                            "address": d.address,
+                            "latitude": d.latitude,
+                            "longitude": d.longitude,
+                            "link": d.link
+                        })
+                else:
+                    # Failed geocoding; NaN coords end up at infinite distance below
+                    d.latitude = d.longitude = float('nan')
+
+        print(f"Batch geocoding {len(unique_developments)} addresses (async)...")
+        start_time = time.time()
+        await geocode_addresses_batch_async(unique_developments, batch_size=10, session=session,
+                                            on_result=record_result)
+        end_time = time.time()
     
-    # Set coordinates and distances for developments that were geocoded
-    for i, (dev, result) in enumerate(zip(developments_to_geocode, geocode_results)):
-        if result:
-            dev.latitude = result['latitude']
-            dev.longitude = result['longitude']
-            distance = haversine_distance_miles(
-                dev.latitude, dev.longitude, 
-                target_result['latitude'], target_result['longitude']
-            )
-            dev.distance = distance
-            cached_developments.append({
-                "address": dev.address,
-                "latitude": dev.latitude,
-                "longitude": dev.longitude,
-                "link": dev.link
-            })
-        else:
-            dev.distance = float('inf')  # Failed geocoding
+        print(f"Geocoded {len(unique_developments)} addresses in {end_time - start_time:.2f} seconds")
     
     developments = geocoded_developments + developments_to_geocode
+
+    # Distances to the target in one vectorized pass; only the likely-closest
+    # candidates get an exact haversine, the rest sort last at +inf
+    lats = np.fromiter((d.latitude for d in developments), dtype=np.float64, count=len(developments))
+    lons = np.fromiter((d.longitude for d in developments), dtype=np.float64, count=len(developments))
+    dists = nearest_distances(lats, lons, target_result['latitude'], target_result['longitude'],
+                              k=PREFILTER_CANDIDATES)
+    for d, dist in zip(developments, dists):
+        d.distance = float(dist)
+
     # Sort by distance
     developments.sort(key=lambda d: d.distance)
     
     # Write the 30 closest developments to a markdown file
-    closest_developments = [d for d in developments if not (d.latitude == 0 and d.longitude == 0)][:30]
+    closest_developments = [d for d in developments if not (d.latitude == 0 and d.longitude == 0)][:NUM_CLOSEST]
+    # Address as a markdown heading with embedded link, distance below; one write
     with open("closest_developments.md", "w", encoding="utf-8") as md_file:
-        for d in closest_developments:
-            # Write address as a markdown heading with embedded link
-            md_file.write(f"## [{d.address}]({d.link})\n")
-            # Write distance below
-            md_file.write(f"Distance from target: {d.distance:.2f} miles\n\n")
+        md_file.write("".join(
+            f"## [{d.address}]({d.link})\nDistance from target: {d.distance:.2f} miles\n\n"
+            for d in closest_developments
+        ))
     print(f"\nWrote {len(closest_developments)} closest developments to closest_developments.md")
     
 
-    with open("cached-developments.json", "w", encoding="utf-8") as f:
-        json.dump(cached_developments, f, ensure_ascii=False, indent=2)
-    
-    print(f"Saved {len(developments)} developments to cached-developments.json")
+    # Only rewrite the cache when this run geocoded something new
+    if len(cached_developments) > num_previously_cached:
+        with open("cached-developments.json", "wb") as f:
+            f.write(orjson.dumps(cached_developments, option=orjson.OPT_INDENT_2))
+        print(f"Saved {len(cached_developments) - num_previously_cached} new developments to cached-developments.json")
 
 
 if __name__ == "__main__":
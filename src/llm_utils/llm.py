@@ -3,11 +3,14 @@ from google.genai import types
 from dotenv import load_dotenv
 import os
 import json
+import logging
 from prompts import DEVELOPMENT_OPPORTUNITIES_PROMPT, GET_SIMILAR_DEVELOPMENT_PROMPT, SUMMARIZATION_PROMPT
 from property_data import get_enhanced_parcel_data, format_property_data_for_llm
 from tavily import TavilyClient
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 tavily_client = TavilyClient(api_key=os.getenv("TAVILY_API_KEY"))
 client = genai.Client(api_key=os.getenv("GOOGLE_API_KEY"))
 
@@ -16,7 +19,7 @@ def web_search(**kwargs) -> str:
     result = tavily_client.search(query=kwargs["query"], max_results=3)
     urls = [r["url"] for r in result["results"]]
     content = "\n".join([r["content"] for r in result["results"]])
-    print(result)
+    logger.debug("Tavily search result: %s", result)
     return {"urls": urls, "content": content}
 
 
@@ -41,7 +44,7 @@ def ask_llm(chat_history: list[dict[str, str]], use_tools: bool = True) -> str:
 
 
 def ask_real_estate_agent(prompt: str, MAX_TOOL_CALLS: int = 10) -> str:
-    print("Real estate report in action...")
+    logger.info("Real estate report in action...")
     chat_history = [
         {"role": "user", "content": "You are an expert real estate developer assistant. Do not use the first person, and provide a professional report format."},
         {"role": "user", "content": prompt}
@@ -50,7 +53,7 @@ def ask_real_estate_agent(prompt: str, MAX_TOOL_CALLS: int = 10) -> str:
     tool_calls = 0
     evidence = []
     while response.candidates[-1].content.parts[-1].function_call and tool_calls < MAX_TOOL_CALLS:
-        print("Tool call detected....")
+        logger.info("Tool call detected....")
         function = response.candidates[-1].content.parts[-1].function_call
         tool_name = function.name
         tool_args = function.args
@@ -60,7 +63,7 @@ def ask_real_estate_agent(prompt: str, MAX_TOOL_CALLS: int = 10) -> str:
         evidence.extend(tool_result["urls"])
         tool_calls += 1
         response = ask_llm(chat_history)
-    print("Answer incoming....")
+    logger.info("Answer incoming....")
     response = ask_llm(chat_history, use_tools=False)
     return {"content": response.candidates[-1].content.parts[-1].text, "evidence": evidence}
 
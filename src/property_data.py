@@ -1,17 +1,70 @@
+import asyncio
+import hashlib
+import html as html_lib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+import aiohttp
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, SoupStrainer
+import orjson
+from lxml import html as lxml_html
 import re
-import json
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
 
 # Base URL for the Boston assessment search
 base_url = 'https://www.cityofboston.gov/assessing/search/'
 
-def get_enhanced_parcel_data(parcelID: str, streetNumber: str, streetName: str, streetSuffix: str, unitNumber: str) -> Dict[str, Optional[str]]:
-    """Enhanced parcel data extraction with all property details needed for development analysis"""
-    
-    # Initialize comprehensive property data structure
-    property_data = {
+# Headers to mimic a real browser request
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Accept-Encoding': ACCEPT_ENCODING,  # gzip/deflate, plus br when Brotli is installed
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+}
+
+# One session for the module so the search and details pages reuse the same connection
+_session = requests.Session()
+_session.headers.update(HEADERS)
+_session.mount('https://', HTTPAdapter(pool_connections=20, pool_maxsize=20,
+                                       max_retries=Retry(total=3, backoff_factor=0.3,
+                                                         status_forcelist=(429, 502, 503, 504),
+                                                         allowed_methods=('GET',))))
+
+def get_session() -> requests.Session:
+    """Return the shared session used for assessing requests (e.g. to adjust headers or adapters)."""
+    return _session
+
+# Assessing pages are well under this; anything bigger is cut off rather than read into memory
+MAX_PAGE_BYTES = 512 * 1024
+PAGE_CHUNK_BYTES = 64 * 1024
+
+def _get_page(url: str, params: Optional[Dict[str, str]] = None) -> bytes:
+    """GET a page body through the shared session, streaming at most MAX_PAGE_BYTES"""
+    with _session.get(url, params=params, timeout=10, stream=True) as response:
+        response.raise_for_status()
+        # Count bytes, not chunks: with chunked transfer encoding each item is one
+        # HTTP chunk, which can be much smaller than PAGE_CHUNK_BYTES
+        body = bytearray()
+        for chunk in response.iter_content(PAGE_CHUNK_BYTES):
+            body += chunk
+            if len(body) >= MAX_PAGE_BYTES:
+                break
+        return bytes(body[:MAX_PAGE_BYTES])
+
+def new_property_data(parcelID: str, streetNumber: str, streetName: str, streetSuffix: str, unitNumber: str) -> Dict[str, Optional[str]]:
+    """Empty property data structure for one parcel, with the identification fields filled in"""
+    return {
         # Basic identification
         'parcel_id': parcelID,
         'address': f"{streetNumber} {streetName} {streetSuffix}".strip(),
@@ -44,32 +97,17 @@ def get_enhanced_parcel_data(parcelID: str, streetNumber: str, streetName: str,
         'building_use': None,
         'exterior_condition': None,
     }
-    
-    # Headers to mimic a real browser request
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-        'Accept-Language': 'en-US,en;q=0.5',
-        'Accept-Encoding': 'gzip, deflate',
-        'Connection': 'keep-alive',
-        'Upgrade-Insecure-Requests': '1',
-    }
-    
-    params = {
-        'parcelID': parcelID,
-        'streetNumber': streetNumber,
-        'streetName': streetName,
-        'streetSuffix': streetSuffix,
-        'unitNumber': unitNumber
-    }
-    
-    response = requests.get(base_url, params=params, headers=headers, timeout=10)
-    response.raise_for_status()
-    
-    soup = BeautifulSoup(response.content, 'html.parser')
-    
-    # Try to parse the search results table first
-    # Look for table rows that contain parcel information
+
+# The search page is only read for its table cells and links; skip head, scripts and styles
+SEARCH_PAGE_STRAINER = SoupStrainer(['tr', 'td', 'a'])
+
+def parse_search_results(soup, property_data: Dict[str, Optional[str]]) -> List[str]:
+    """
+    Fill property_data from the search results page and return the details
+    page URLs found on it, in page order.
+    """
+    # Walk the search results table; only result rows have 4+ cells, and with
+    # several matches the last row's values win
     rows = soup.find_all('tr')
     for row in rows:
         cells = row.find_all('td')
@@ -90,6 +128,7 @@ def get_enhanced_parcel_data(parcelID: str, streetNumber: str, streetName: str,
                     property_data['owner'] = cell_text
     
     # Look for "Details" link to get more detailed information
+    details_urls = []
     details_links = soup.find_all('a', href=True)
     for link in details_links:
         link_text = link.get_text(strip=True).lower()
@@ -103,171 +142,343 @@ def get_enhanced_parcel_data(parcelID: str, streetNumber: str, streetName: str,
                 details_url = 'https://www.cityofboston.gov/assessing/search/' + details_url
             elif not details_url.startswith('http'):
                 details_url = 'https://www.cityofboston.gov' + details_url
-            
-            print(f"Following details link: {details_url}")
-            
-            # Fetch detailed property information
-            try:
-                details_response = requests.get(details_url, headers=headers, timeout=10)
-                details_response.raise_for_status()
-                details_soup = BeautifulSoup(details_response.content, 'html.parser')
-                
-                # Extract detailed information from the details page
-                detailed_data = parse_property_details(details_soup)
-                property_data.update(detailed_data)
-                
-                print(f"Successfully extracted {len(detailed_data)} additional fields from details page")
-                break
-                
-            except Exception as e:
-                print(f"Error fetching property details from {details_url}: {e}")
-                continue
+            details_urls.append(details_url)
     
-    # Extract building values if available on main page
-    building_values = get_building_value(soup)
+    return details_urls
+
+def apply_building_values(content: bytes, property_data: Dict[str, Optional[str]]) -> None:
+    """Extract building values if available on main page"""
+    building_values = get_building_value(content)
     if any(building_values.values()):
         property_data.update({
             'fy2025_building_value': building_values.get("FY2025 Building value"),
             'fy2025_land_value': building_values.get("FY2025 Land value"),
             'fy2025_total_value': building_values.get("FY2025 Total value")
         })
+
+def needs_details_page(content: bytes, property_data: Dict[str, Optional[str]]) -> bool:
+    """
+    False when the search page already has all three FY2025 values and the core
+    property fields (read from its labelled rows by _read_search_page), so
+    following the details link would add nothing we need.
+    """
+    building_values = get_building_value(content)  # memoized, so apply_building_values reuses it
+    if len(building_values) < len(FY2025_VALUE_KEYS):
+        return True
+    return not all(property_data.get(k) for k in ('property_type', 'year_built', 'lot_size'))
+
+def get_enhanced_parcel_data(parcelID: str, streetNumber: str, streetName: str, streetSuffix: str, unitNumber: str) -> Dict[str, Optional[str]]:
+    """Enhanced parcel data extraction with all property details needed for development analysis"""
+    
+    # Initialize comprehensive property data structure
+    property_data = new_property_data(parcelID, streetNumber, streetName, streetSuffix, unitNumber)
+    
+    params = {
+        'parcelID': parcelID,
+        'streetNumber': streetNumber,
+        'streetName': streetName,
+        'streetSuffix': streetSuffix,
+        'unitNumber': unitNumber
+    }
+    
+    content = _get_page(base_url, params=params)
+    details_urls = _read_search_page(content, property_data)
+    
+    for details_url in details_urls:
+        logger.debug("Following details link: %s", details_url)
+        
+        # Fetch detailed property information; transient errors are retried by the
+        # session adapter, and the search page data is still returned if it fails
+        try:
+            details_content = _get_page(details_url)
+            
+            # Extract detailed information from the details page
+            detailed_data = parse_property_details(details_content)
+            property_data.update(detailed_data)
+            
+            logger.debug("Successfully extracted %d additional fields from details page", len(detailed_data))
+            break
+            
+        except Exception as e:
+            logger.warning("Error fetching property details from %s: %s", details_url, e)
+            continue
+    
+    apply_building_values(content, property_data)
     
     return property_data
 
-def parse_property_details(soup) -> Dict[str, Optional[str]]:
+# ========== ASYNC FETCHING ==========
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+async def _fetch_async(session: aiohttp.ClientSession, url: str, params: Optional[Dict[str, str]] = None,
+                       retries: int = 3, backoff: float = 0.3) -> bytes:
+    """GET a page body (capped at MAX_PAGE_BYTES), retrying 429/5xx responses with exponential backoff"""
+    for attempt in range(retries + 1):
+        async with session.get(url, params=params) as response:
+            if response.status not in RETRY_STATUSES or attempt == retries:
+                response.raise_for_status()
+                body = bytearray()
+                async for chunk in response.content.iter_chunked(PAGE_CHUNK_BYTES):
+                    body += chunk
+                    if len(body) >= MAX_PAGE_BYTES:
+                        break
+                return bytes(body[:MAX_PAGE_BYTES])
+        await asyncio.sleep(backoff * 2 ** attempt)
+
+PARSE_EXECUTOR = ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4))
+
+def _read_search_page(content: bytes, property_data: Dict[str, Optional[str]]) -> List[str]:
+    """Fill property_data from the search page; return the details URLs still worth fetching"""
+    soup = BeautifulSoup(content, 'lxml', parse_only=SEARCH_PAGE_STRAINER)
+    details_urls = parse_search_results(soup, property_data)
+    # A search matching a single parcel can come back as that parcel's own page;
+    # its labelled fields are what decide whether the details link adds anything
+    property_data.update(parse_property_details(content))
+    if not needs_details_page(content, property_data):
+        return []
+    return details_urls
+
+async def get_enhanced_parcel_data_async(session: aiohttp.ClientSession, parcelID: str, streetNumber: str,
+                                         streetName: str, streetSuffix: str, unitNumber: str) -> Dict[str, Optional[str]]:
+    """Async version of get_enhanced_parcel_data; the search and details pages share `session`"""
+    property_data = new_property_data(parcelID, streetNumber, streetName, streetSuffix, unitNumber)
+    
+    params = {
+        'parcelID': parcelID,
+        'streetNumber': streetNumber,
+        'streetName': streetName,
+        'streetSuffix': streetSuffix,
+        'unitNumber': unitNumber
+    }
+    
+    # Parsing is CPU work; run it on the parse pool so the event loop keeps
+    # the other fetches moving
+    loop = asyncio.get_running_loop()
+    
+    content = await _fetch_async(session, base_url, params=params)
+    details_urls = await loop.run_in_executor(PARSE_EXECUTOR, _read_search_page, content, property_data)
+    
+    for details_url in details_urls:
+        logger.debug("Following details link: %s", details_url)
+        
+        try:
+            details_content = await _fetch_async(session, details_url)
+            detailed_data = await loop.run_in_executor(PARSE_EXECUTOR, parse_property_details, details_content)
+            property_data.update(detailed_data)
+            
+            logger.debug("Successfully extracted %d additional fields from details page", len(detailed_data))
+            break
+            
+        except Exception as e:
+            logger.warning("Error fetching property details from %s: %s", details_url, e)
+            continue
+    
+    apply_building_values(content, property_data)
+    
+    return property_data
+
+async def fetch_many(parcel_requests: List[Tuple[str, str, str, str, str]],
+                     concurrency: int = 64) -> List[Optional[Dict[str, Optional[str]]]]:
+    """
+    Fetch many parcels concurrently over one session.
+    
+    Args:
+        parcel_requests: (parcelID, streetNumber, streetName, streetSuffix, unitNumber) tuples
+        concurrency: Maximum number of parcels in flight at once
+    
+    Returns:
+        Property data per request, in order (None if the lookup failed)
+    """
+    sem = asyncio.Semaphore(concurrency)
+    
+    async def fetch_one(session: aiohttp.ClientSession, request: Tuple[str, str, str, str, str]):
+        async with sem:
+            try:
+                return await get_enhanced_parcel_data_async(session, *request)
+            except Exception as e:
+                logger.warning("Error fetching parcel data for %s: %s", request, e)
+                return None
+    
+    async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit_per_host=concurrency),
+                                     headers=HEADERS,
+                                     timeout=aiohttp.ClientTimeout(total=10)) as session:
+        return await asyncio.gather(*(fetch_one(session, r) for r in parcel_requests))
+
+def _cached_by_content_hash(maxsize: int = 256):
+    """
+    LRU-cache a page parser on a blake2b digest of the page bytes, so the same
+    page is only parsed once and the bytes themselves aren't kept alive as keys.
+    Callers get a copy of the cached dict.
+    """
+    def decorator(parse):
+        cache = OrderedDict()
+        lock = threading.Lock()  # parsers also run on the async path's thread pool
+        
+        @wraps(parse)
+        def wrapper(content: bytes):
+            key = hashlib.blake2b(content, digest_size=16).digest()
+            with lock:
+                result = cache.get(key)
+                if result is not None:
+                    cache.move_to_end(key)
+            if result is None:
+                result = parse(content)
+                with lock:
+                    cache[key] = result
+                    if len(cache) > maxsize:
+                        cache.popitem(last=False)
+            return dict(result)
+        
+        wrapper.cache_clear = cache.clear
+        return wrapper
+    return decorator
+
+# Details-page labels (lower-cased, colons removed) -> our field names, in match priority.
+# A label matches when it contains the phrase and none of the excluded words.
+MAIN_LABELS = (
+    ('parcel id', 'parcel_id', ()),
+    ('property type', 'property_type', ()),
+    ('classification code', 'classification_code', ()),
+    ('lot size', 'lot_size', ()),
+    ('living area', 'living_area', ()),
+    ('year built', 'year_built', ()),
+    ('owner on', 'owner', ()),
+    ("owner's mailing address", 'owner_address', ()),
+)
+BUILDING_LABELS = (
+    ('total rooms', 'total_rooms', ()),
+    ('bedrooms', 'bedrooms', ()),
+    ('bathrooms', 'bathrooms', ('half',)),
+    ('number of kitchens', 'number_of_kitchens', ()),
+    ('parking spots', 'parking_spaces', ()),
+    ('story height', 'stories', ()),
+    ('interior condition', 'interior_condition', ()),
+    ('exterior condition', 'exterior_condition', ()),
+    ('land use', 'land_use', ()),
+    ('style', 'building_style', ('bath', 'kitchen')),
+    ('heat type', 'heat_type', ()),
+    ('ac type', 'ac_type', ()),
+    ('exterior finish', 'exterior_finish', ()),
+    ('foundation', 'foundation', ()),
+)
+# Exact labels resolve with one dict lookup; anything else falls back to the phrase scan
+MAIN_LABEL_MAP = {phrase: key for phrase, key, _ in MAIN_LABELS}
+BUILDING_LABEL_MAP = {phrase: key for phrase, key, _ in BUILDING_LABELS}
+
+def _label_key(label: str, labels, label_map: Dict[str, str]) -> Optional[str]:
+    """Field name for a details-page label, or None if we don't track it"""
+    key = label_map.get(label)
+    if key is None:
+        for phrase, field, excluded in labels:
+            if phrase in label and not any(word in label for word in excluded):
+                return field
+    return key
+
+def _cell_text(el) -> str:
+    """Text of an element with each fragment stripped, like BeautifulSoup's get_text(strip=True)"""
+    return ''.join(s.strip() for s in el.itertext())
+
+FY2025_DETAIL_LABELS = (
+    ('FY2025 Building value:', 'fy2025_building_value'),
+    ('FY2025 Land Value:', 'fy2025_land_value'),
+    ('FY2025 Total Assessed Value:', 'fy2025_total_value'),
+)
+
+def _fy2025_key(text: str) -> Optional[str]:
+    return next((key for phrase, key in FY2025_DETAIL_LABELS if phrase in text), None)
+
+@_cached_by_content_hash()
+def parse_property_details(content: bytes) -> Dict[str, Optional[str]]:
     """Parse detailed property information from the Boston assessment details page"""
     details = {}
+    if not content.strip():
+        return details
+    tree = lxml_html.fromstring(content)
     
     # Parse the main property information table (class="mainCategoryModuleText")
-    main_rows = soup.find_all('tr', class_='mainCategoryModuleText')
+    main_rows = tree.xpath("//tr[contains(concat(' ', normalize-space(@class), ' '), ' mainCategoryModuleText ')]")
     for row in main_rows:
-        cells = row.find_all('td')
+        cells = row.xpath('.//td')
         if len(cells) == 2:
-            label = cells[0].get_text(strip=True).replace(':', '').lower()
-            value = cells[1].get_text(strip=True)
+            label = _cell_text(cells[0]).replace(':', '').lower()
+            value = _cell_text(cells[1])
             
             # Map the labels to our data structure
-            if 'parcel id' in label:
-                details['parcel_id'] = value
-            elif 'property type' in label:
-                details['property_type'] = value
-            elif 'classification code' in label:
-                details['classification_code'] = value
-            elif 'lot size' in label:
-                details['lot_size'] = value
-            elif 'living area' in label:
-                details['living_area'] = value
-            elif 'year built' in label:
-                details['year_built'] = value
-            elif 'owner on' in label and not details.get('owner'):
-                # Extract owner from the link or text
-                owner_link = cells[1].find('a')
-                if owner_link:
-                    details['owner'] = owner_link.get_text(strip=True)
-                else:
-                    details['owner'] = value
-            elif 'owner\'s mailing address' in label:
-                details['owner_address'] = value
-    
-    # Parse financial data from the Value/Tax section
-    value_cells = soup.find_all('td')
-    for i, cell in enumerate(value_cells):
-        text = cell.get_text(strip=True)
+            key = _label_key(label, MAIN_LABELS, MAIN_LABEL_MAP)
+            if key == 'owner':
+                if not details.get('owner'):
+                    # Extract owner from the link or text
+                    owner_link = cells[1].find('.//a')
+                    details['owner'] = _cell_text(owner_link) if owner_link is not None else value
+            elif key:
+                details[key] = value
+    
+    # Parse financial data from the Value/Tax section: only cells mentioning FY2025,
+    # each paired with the value cell next to it in the same row
+    for cell in tree.xpath("//td[contains(., 'FY2025')]"):
+        text = _cell_text(cell)
         
-        if 'FY2025 Building value:' in text:
-            # Look for the value in the next cell or extract from current cell
-            try:
-                if i + 1 < len(value_cells):
-                    next_cell = value_cells[i + 1]
-                    value_text = next_cell.get_text(strip=True)
-                    if value_text.startswith('$'):
-                        details['fy2025_building_value'] = value_text
-            except:
-                pass
-                
-        elif 'FY2025 Land Value:' in text:
-            try:
-                if i + 1 < len(value_cells):
-                    next_cell = value_cells[i + 1]
-                    value_text = next_cell.get_text(strip=True)
-                    if value_text.startswith('$'):
-                        details['fy2025_land_value'] = value_text
-            except:
-                pass
-                
-        elif 'FY2025 Total Assessed Value:' in text:
-            try:
-                if i + 1 < len(value_cells):
-                    next_cell = value_cells[i + 1]
-                    value_text = next_cell.get_text(strip=True)
-                    if value_text.startswith('$'):
-                        details['fy2025_total_value'] = value_text
-            except:
-                pass
+        key = _fy2025_key(text)
+        if key is None:
+            continue
+        
+        next_cell = cell.xpath('following-sibling::td[1]')
+        if next_cell:
+            value_text = _cell_text(next_cell[0])
+            if value_text.startswith('$'):
+                details[key] = value_text
     
     # Parse detailed building attributes (the italicized fields in BUILDING 1 section)
-    italic_cells = soup.find_all('i')
+    italic_cells = tree.xpath('//i')
     for italic in italic_cells:
-        label = italic.get_text(strip=True).replace(':', '').lower()
+        label = _cell_text(italic).replace(':', '').lower()
         
         # Find the corresponding value in the next cell
-        parent_row = italic.find_parent('tr')
+        parent_row = italic.xpath('ancestor::tr[1]')
         if parent_row:
-            cells = parent_row.find_all('td')
+            cells = parent_row[0].xpath('.//td')
             if len(cells) >= 2:
-                value = cells[1].get_text(strip=True)
+                value = _cell_text(cells[1])
                 
                 # Map detailed attributes
-                if 'total rooms' in label:
-                    details['total_rooms'] = value
-                elif 'bedrooms' in label:
-                    details['bedrooms'] = value
-                elif 'bathrooms' in label and 'half' not in label:
-                    details['bathrooms'] = value
-                elif 'number of kitchens' in label:
-                    details['number_of_kitchens'] = value
-                elif 'parking spots' in label:
-                    details['parking_spaces'] = value
-                elif 'story height' in label:
-                    details['stories'] = value
-                elif 'interior condition' in label:
-                    details['interior_condition'] = value
-                elif 'exterior condition' in label:
-                    details['exterior_condition'] = value
-                elif 'land use' in label:
-                    details['land_use'] = value
-                elif 'style' in label and 'bath' not in label and 'kitchen' not in label:
-                    details['building_style'] = value
-                elif 'heat type' in label:
-                    details['heat_type'] = value
-                elif 'ac type' in label:
-                    details['ac_type'] = value
-                elif 'exterior finish' in label:
-                    details['exterior_finish'] = value
-                elif 'foundation' in label:
-                    details['foundation'] = value
+                key = _label_key(label, BUILDING_LABELS, BUILDING_LABEL_MAP)
+                if key:
+                    details[key] = value
     
     return details
 
-def get_building_value(soup) -> Dict[str, Optional[str]]:
+# Common patterns for FY2025 values, combined into one alternation. Text between
+# "Total" and "value" can't hold a digit or $, so it never runs into the next value
+FY2025_VALUE_RE = re.compile(r'FY2025 (?P<kind>Building |Land |Total[^$\d]*?)value[:\s]*\$?(?P<amount>[\d,]+\.?\d*)', re.IGNORECASE)
+TAG_RE = re.compile(r'<[^>]*>')
+FY2025_VALUE_KEYS = {
+    'building': 'FY2025 Building value',
+    'land': 'FY2025 Land value',
+    'total': 'FY2025 Total value',
+}
+
+@_cached_by_content_hash()
+def get_building_value(content: bytes) -> Dict[str, Optional[str]]:
     """Extract building values from the page"""
     values = {}
     
-    # Look for value patterns in the text
-    page_text = soup.get_text()
-    
-    # Common patterns for FY2025 values
-    fy2025_patterns = [
-        (r'FY2025 Building value[:\s]*\$?([\d,]+\.?\d*)', 'FY2025 Building value'),
-        (r'FY2025 Land [Vv]alue[:\s]*\$?([\d,]+\.?\d*)', 'FY2025 Land value'),
-        (r'FY2025 Total.*?[Vv]alue[:\s]*\$?([\d,]+\.?\d*)', 'FY2025 Total value')
-    ]
-    
-    for pattern, key in fy2025_patterns:
-        match = re.search(pattern, page_text, re.IGNORECASE)
-        if match:
-            value = match.group(1).replace(',', '')
-            values[key] = f"${value}"
+    # Fast path: most search pages carry no FY2025 values at all
+    start = content.find(b'FY2025')
+    if start < 0:
+        return values
+    
+    # Look for value patterns in the text from the first hit on, with tags stripped
+    # (cheaper than building a tree just to read its text)
+    page_text = html_lib.unescape(TAG_RE.sub('', content[start:].decode('utf-8', 'ignore')))
+    
+    # One pass over the page text; keep the first match of each kind
+    for match in FY2025_VALUE_RE.finditer(page_text):
+        key = FY2025_VALUE_KEYS[match.group('kind').split()[0].lower()]
+        if key not in values:
+            values[key] = f"${match.group('amount').replace(',', '')}"
+            if len(values) == len(FY2025_VALUE_KEYS):
+                break
     
     return values
 
@@ -277,6 +488,54 @@ def get_property_data_by_parcel_id(parcel_id: str) -> Dict[str, Optional[str]]:
     # Use empty strings for street components when we only have parcel ID
     return get_enhanced_parcel_data(parcel_id, "", "", "", "")
 
+# Sections of the LLM summary: (title, ((property_data key, label), ...)), in output order
+LLM_SECTIONS = (
+    ("PROPERTY IDENTIFICATION", (
+        ('address', "Address"),
+        ('unit_number', "Unit"),
+        ('parcel_id', "Parcel ID"),
+        ('property_type', "Property Type"),
+        ('classification_code', "Classification"),
+    )),
+    ("PHYSICAL CHARACTERISTICS", (
+        ('lot_size', "Lot Size"),
+        ('living_area', "Living Area"),
+        ('year_built', "Year Built"),
+        ('stories', "Stories"),
+        ('building_style', "Style"),
+    )),
+    ("INTERIOR DETAILS", (
+        ('bedrooms', "Bedrooms"),
+        ('bathrooms', "Bathrooms"),
+        ('total_rooms', "Total Rooms"),
+        ('number_of_kitchens', "Kitchens"),
+        ('parking_spaces', "Parking Spaces"),
+    )),
+    ("CONDITION AND FEATURES", (
+        ('interior_condition', "Interior Condition"),
+        ('exterior_condition', "Exterior Condition"),
+        ('exterior_finish', "Exterior Finish"),
+        ('foundation', "Foundation"),
+        ('heat_type', "Heating"),
+        ('ac_type', "Air Conditioning"),
+    )),
+    ("FINANCIAL INFORMATION", (
+        ('fy2025_building_value', "Building Value"),
+        ('fy2025_land_value', "Land Value"),
+        ('fy2025_total_value', "Total Assessed Value"),
+        ('previous_year_value', "Previous Year Value"),
+    )),
+    ("OWNERSHIP INFORMATION", (
+        ('owner', "Owner"),
+        ('owner_address', "Owner Address"),
+    )),
+    ("ZONING AND LAND USE", (
+        ('zoning', "Zoning"),
+        ('land_use', "Land Use"),
+        ('building_use', "Building Use"),
+    )),
+)
+
 def format_property_data_for_llm(property_data: Dict[str, Optional[str]]) -> str:
     """
     Format property data in a structured way that's conducive for LLM processing.
@@ -290,118 +549,19 @@ def format_property_data_for_llm(property_data: Dict[str, Optional[str]]) -> str
     if not property_data:
         return "No property data available."
     
-    # Initialize sections
     sections = []
-    
-    # Basic Property Information
-    basic_info = []
-    if property_data.get('address'):
-        basic_info.append(f"Address: {property_data['address']}")
-    if property_data.get('unit_number'):
-        basic_info.append(f"Unit: {property_data['unit_number']}")
-    if property_data.get('parcel_id'):
-        basic_info.append(f"Parcel ID: {property_data['parcel_id']}")
-    if property_data.get('property_type'):
-        basic_info.append(f"Property Type: {property_data['property_type']}")
-    if property_data.get('classification_code'):
-        basic_info.append(f"Classification: {property_data['classification_code']}")
-    
-    if basic_info:
-        sections.append("PROPERTY IDENTIFICATION:\n" + "\n".join(basic_info))
-    
-    # Physical Characteristics
-    physical_info = []
-    if property_data.get('lot_size'):
-        physical_info.append(f"Lot Size: {property_data['lot_size']}")
-    if property_data.get('living_area'):
-        physical_info.append(f"Living Area: {property_data['living_area']}")
-    if property_data.get('year_built'):
-        physical_info.append(f"Year Built: {property_data['year_built']}")
-    if property_data.get('stories'):
-        physical_info.append(f"Stories: {property_data['stories']}")
-    if property_data.get('building_style'):
-        physical_info.append(f"Style: {property_data['building_style']}")
-    
-    if physical_info:
-        sections.append("PHYSICAL CHARACTERISTICS:\n" + "\n".join(physical_info))
-    
-    # Interior Details
-    interior_info = []
-    if property_data.get('bedrooms'):
-        interior_info.append(f"Bedrooms: {property_data['bedrooms']}")
-    if property_data.get('bathrooms'):
-        interior_info.append(f"Bathrooms: {property_data['bathrooms']}")
-    if property_data.get('total_rooms'):
-        interior_info.append(f"Total Rooms: {property_data['total_rooms']}")
-    if property_data.get('number_of_kitchens'):
-        interior_info.append(f"Kitchens: {property_data['number_of_kitchens']}")
-    if property_data.get('parking_spaces'):
-        interior_info.append(f"Parking Spaces: {property_data['parking_spaces']}")
-    
-    if interior_info:
-        sections.append("INTERIOR DETAILS:\n" + "\n".join(interior_info))
-    
-    # Condition and Features
-    condition_info = []
-    if property_data.get('interior_condition'):
-        condition_info.append(f"Interior Condition: {property_data['interior_condition']}")
-    if property_data.get('exterior_condition'):
-        condition_info.append(f"Exterior Condition: {property_data['exterior_condition']}")
-    if property_data.get('exterior_finish'):
-        condition_info.append(f"Exterior Finish: {property_data['exterior_finish']}")
-    if property_data.get('foundation'):
-        condition_info.append(f"Foundation: {property_data['foundation']}")
-    if property_data.get('heat_type'):
-        condition_info.append(f"Heating: {property_data['heat_type']}")
-    if property_data.get('ac_type'):
-        condition_info.append(f"Air Conditioning: {property_data['ac_type']}")
-    
-    if condition_info:
-        sections.append("CONDITION AND FEATURES:\n" + "\n".join(condition_info))
-    
-    # Financial Information
-    financial_info = []
-    if property_data.get('fy2025_building_value'):
-        financial_info.append(f"Building Value: {property_data['fy2025_building_value']}")
-    if property_data.get('fy2025_land_value'):
-        financial_info.append(f"Land Value: {property_data['fy2025_land_value']}")
-    if property_data.get('fy2025_total_value'):
-        financial_info.append(f"Total Assessed Value: {property_data['fy2025_total_value']}")
-    if property_data.get('previous_year_value'):
-        financial_info.append(f"Previous Year Value: {property_data['previous_year_value']}")
-    
-    if financial_info:
-        sections.append("FINANCIAL INFORMATION:\n" + "\n".join(financial_info))
-    
-    # Ownership Information
-    ownership_info = []
-    if property_data.get('owner'):
-        ownership_info.append(f"Owner: {property_data['owner']}")
-    if property_data.get('owner_address'):
-        ownership_info.append(f"Owner Address: {property_data['owner_address']}")
-    
-    if ownership_info:
-        sections.append("OWNERSHIP INFORMATION:\n" + "\n".join(ownership_info))
-    
-    # Zoning and Land Use
-    zoning_info = []
-    if property_data.get('zoning'):
-        zoning_info.append(f"Zoning: {property_data['zoning']}")
-    if property_data.get('land_use'):
-        zoning_info.append(f"Land Use: {property_data['land_use']}")
-    if property_data.get('building_use'):
-        zoning_info.append(f"Building Use: {property_data['building_use']}")
-    
-    if zoning_info:
-        sections.append("ZONING AND LAND USE:\n" + "\n".join(zoning_info))
+    for title, fields in LLM_SECTIONS:
+        lines = [f"{label}: {value}" for key, label in fields if (value := property_data.get(key))]
+        if lines:
+            sections.append(f"{title}:\n" + "\n".join(lines))
     
     # Combine all sections with clear separators
-    formatted_output = "\n\n".join(sections)
-    
-    return formatted_output
+    return "\n\n".join(sections)
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG)
+    
     # Test with a few different properties
     test_address = "263 N Harvard St"
     print(f"Testing parcel data extraction for: {test_address}")
@@ -410,7 +570,7 @@ if __name__ == "__main__":
     result = get_enhanced_parcel_data("", "263", "N Harvard", "St", "")
     
     print(f"\nResults for {test_address}:")
-    print(json.dumps(result, indent=2))
+    print(orjson.dumps(result, option=orjson.OPT_INDENT_2).decode())
     
     # Test the LLM formatting function with example data
     print("\n" + "="*50)
@@ -1,12 +1,22 @@
 # boston_zoning_article_from_coords.py
-import json
+import asyncio
+import copy
 import re
+from functools import lru_cache
+import aiohttp
+import orjson
 import requests
-from typing import Dict, Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Dict, List, Optional, Tuple
 
 BPDA_SUBDISTRICTS = "https://gis.bostonplans.org/hosting/rest/services/Zoning_Subdistricts_Data/FeatureServer/0/query"
 BPDA_DISTRICTS    = "https://gis.bostonplans.org/hosting/rest/services/Zoning_Districts/FeatureServer/0/query"
 
+# Layer fields each point query asks for
+SUBDISTRICT_FIELDS = "Article,Zoning_Subdistrict,Zoning_District,Urban_Name,Map_Number,Municode_Reference_to_Restricti"
+DISTRICT_FIELDS = "ARTICLE,DISTRICT,MAPNO"
+
 # Known direct links to the "main" article page in Municode (not just the Tables page).
 # This doesn't need to be exhaustive—there's a robust fallback below that always works.
 ARTICLE_MAIN = {
@@ -28,32 +38,54 @@ ARTICLE_MAIN = {
     # Add more as you prefer; the fallback below covers everything else.
 }
 
-NEIGHBORHOOD_ARTICLES = {50,51,53,54,55,56,58,59,61,62,64,65,66,67,68,69}
+NEIGHBORHOOD_ARTICLES = frozenset({50,51,53,54,55,56,58,59,61,62,64,65,66,67,68,69})
 
-def _arcgis_point_query(url: str, lat: float, lon: float, out_fields: str):
-    """
-    Spatially query an ArcGIS FeatureServer layer with a (lon,lat) point (WGS84).
-    Returns the features list (may be empty).
-    """
-    params = {
+# Shared session so repeated point queries to gis.bostonplans.org keep the connection alive
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_connections=20, pool_maxsize=20,
+                                       max_retries=Retry(total=3, backoff_factor=0.3)))
+
+def get_session() -> requests.Session:
+    """Return the shared session used for ArcGIS queries."""
+    return _session
+
+def _point_query_params(lat: float, lon: float, out_fields: str) -> Dict:
+    return {
         "f": "json",
         "returnGeometry": "false",
         "spatialRel": "esriSpatialRelIntersects",
-        "geometry": json.dumps({"x": float(lon), "y": float(lat)}),
+        "geometry": f'{{"x":{float(lon)},"y":{float(lat)}}}',  # point JSON, no encoder needed
         "geometryType": "esriGeometryPoint",
         "inSR": 4326,  # WGS84
         "outFields": out_fields,
     }
-    r = requests.get(url, params=params, timeout=15)
-    r.raise_for_status()
-    data = r.json()
+
+def _features(data: Dict):
     if "error" in data:
         # ArcGIS errors sometimes show in 200 responses
         raise RuntimeError(f"ArcGIS error: {data['error']}")
     return data.get("features", [])
 
+def _arcgis_point_query(url: str, lat: float, lon: float, out_fields: str):
+    """
+    Spatially query an ArcGIS FeatureServer layer with a (lon,lat) point (WGS84).
+    Returns the features list (may be empty).
+    """
+    r = _session.get(url, params=_point_query_params(lat, lon, out_fields), timeout=15)
+    r.raise_for_status()
+    return _features(orjson.loads(r.content))
+
+async def _arcgis_point_query_async(session: aiohttp.ClientSession, url: str, lat: float, lon: float, out_fields: str):
+    """Async version of _arcgis_point_query"""
+    params = _point_query_params(lat, lon, out_fields)
+    async with session.get(url, params=params) as r:
+        r.raise_for_status()
+        return _features(orjson.loads(await r.read()))
+
+_NUM_RE = re.compile(r"\d{1,3}")
+
 def _first_numeric(s: str) -> Optional[str]:
-    m = re.search(r"\d{1,3}", s or "")
+    m = _NUM_RE.search(s or "")
     return m.group(0) if m else None
 
 def _pick_best_article(candidates: Dict[str, dict]) -> Optional[str]:
@@ -62,12 +94,9 @@ def _pick_best_article(candidates: Dict[str, dict]) -> Optional[str]:
     Otherwise, just pick the first.
     """
     # Prefer neighborhood articles
-    for art, _ in candidates.items():
-        try:
-            if int(art) in NEIGHBORHOOD_ARTICLES:
-                return art
-        except ValueError:
-            pass
+    for art in candidates:
+        if art.isdigit() and int(art) in NEIGHBORHOOD_ARTICLES:
+            return art
     # Fallback to the first available key
     return next(iter(candidates.keys()), None)
 
@@ -83,14 +112,30 @@ def municode_article_url(article_num: str) -> Dict[str, Optional[str]]:
 def get_municode_article_from_coords(lat: float, lon: float) -> Dict:
     """
     Given WGS84 coordinates, return the applicable Zoning Article number and useful Municode links.
+    Lookups are cached on a ~11 m grid (coordinates rounded to 4 decimals); zoning polygons
+    change on the order of years, so nearby repeat queries are served from memory.
     """
+    # Deep copy: the cached result holds nested dicts (context, municode links)
+    result = copy.deepcopy(_cached_article_from_coords(round(lat, 4), round(lon, 4)))
+    result["input"] = {"lat": lat, "lon": lon}
+    return result
+
+@lru_cache(maxsize=4096)
+def _cached_article_from_coords(lat: float, lon: float) -> Dict:
     # 1) Try subdistricts (has rich fields incl. Article)
-    sub_feats = _arcgis_point_query(
-        BPDA_SUBDISTRICTS,
-        lat, lon,
-        out_fields="Article,Zoning_Subdistrict,Zoning_District,Urban_Name,Map_Number,Municode_Reference_to_Restricti"
-    )
+    result = _article_from_subdistricts(lat, lon, _arcgis_point_query(BPDA_SUBDISTRICTS, lat, lon, SUBDISTRICT_FIELDS))
+    if result:
+        return result
+
+    # 2) Fallback to district layer (also has ARTICLE)
+    result = _article_from_districts(lat, lon, _arcgis_point_query(BPDA_DISTRICTS, lat, lon, DISTRICT_FIELDS))
+    if result:
+        return result
+
+    # 3) Outside Boston or no zoning polygon found
+    return _no_zoning_polygon(lat, lon)
 
+def _article_from_subdistricts(lat: float, lon: float, sub_feats) -> Optional[Dict]:
     candidates = {}
     context = {}
     if sub_feats:
@@ -118,14 +163,9 @@ def get_municode_article_from_coords(lat: float, lon: float) -> Dict:
                 },
                 "municode": urls,
             }
+    return None
 
-    # 2) Fallback to district layer (also has ARTICLE)
-    dist_feats = _arcgis_point_query(
-        BPDA_DISTRICTS,
-        lat, lon,
-        out_fields="ARTICLE,DISTRICT,MAPNO"
-    )
-
+def _article_from_districts(lat: float, lon: float, dist_feats) -> Optional[Dict]:
     if dist_feats:
         # Usually only one
         attrs = (dist_feats[0].get("attributes") or {})
@@ -141,15 +181,55 @@ def get_municode_article_from_coords(lat: float, lon: float) -> Dict:
                 },
                 "municode": urls,
             }
+    return None
 
-    # 3) Outside Boston or no zoning polygon found
+def _no_zoning_polygon(lat: float, lon: float, error: str = "No Boston zoning polygon found at this location.") -> Dict:
     return {
         "input": {"lat": lat, "lon": lon},
         "article": None,
-        "error": "No Boston zoning polygon found at this location."
+        "error": error
     }
 
+async def zoning_for_points(points: List[Tuple[float, float]]) -> List[Dict]:
+    """
+    Zoning article lookup for many (lat, lon) points over one aiohttp session.
+    All subdistrict queries run concurrently, then one concurrent district
+    fallback round for the points the subdistrict layer missed.
+    Returns one result per point, in order, shaped like get_municode_article_from_coords.
+    """
+    results: List[Optional[Dict]] = [None] * len(points)
+    async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=15)) as session:
+        # 1) Subdistricts for every point
+        sub_feats = await asyncio.gather(
+            *(_arcgis_point_query_async(session, BPDA_SUBDISTRICTS, lat, lon, SUBDISTRICT_FIELDS) for lat, lon in points),
+            return_exceptions=True,
+        )
+        misses = []
+        for i, ((lat, lon), feats) in enumerate(zip(points, sub_feats)):
+            if isinstance(feats, Exception):
+                results[i] = _no_zoning_polygon(lat, lon, error=f"ArcGIS query failed: {feats}")
+            else:
+                results[i] = _article_from_subdistricts(lat, lon, feats)
+                if results[i] is None:
+                    misses.append(i)
+
+        # 2) Districts for the misses only
+        dist_feats = await asyncio.gather(
+            *(_arcgis_point_query_async(session, BPDA_DISTRICTS, *points[i], DISTRICT_FIELDS) for i in misses),
+            return_exceptions=True,
+        )
+        for i, feats in zip(misses, dist_feats):
+            lat, lon = points[i]
+            if isinstance(feats, Exception):
+                results[i] = _no_zoning_polygon(lat, lon, error=f"ArcGIS query failed: {feats}")
+            else:
+                results[i] = _article_from_districts(lat, lon, feats) or _no_zoning_polygon(lat, lon)
+    return results
+
+get_municode_article_from_coords.cache_info = _cached_article_from_coords.cache_info
+get_municode_article_from_coords.cache_clear = _cached_article_from_coords.cache_clear
+
 if __name__ == "__main__":
     # Example: Allston (approx.)
     result = get_municode_article_from_coords(42.3539, -71.1337)
-    print(json.dumps(result, indent=2))
+    print(orjson.dumps(result, option=orjson.OPT_INDENT_2).decode())
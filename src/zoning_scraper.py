@@ -1,71 +1,132 @@
+import asyncio
+import logging
 import requests
-import json
+import aiohttp
+import orjson
+import os
+import shelve
+import sys
+import threading
 import time
-from urllib.parse import quote
+from collections import OrderedDict
+from contextlib import contextmanager, nullcontext
+from urllib.parse import quote, urlsplit
 import re
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-def geocode_boston_address(address):
+logger = logging.getLogger(__name__)
+
+# One session for every scraper instance and the module-level geocoders, so
+# repeat calls to ArcGIS / Nominatim / Boston GIS reuse warm connections
+_SHARED_SESSION = requests.Session()
+_SHARED_ADAPTER = HTTPAdapter(pool_connections=8, pool_maxsize=32,
+                              max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504]))
+_SHARED_SESSION.mount("https://", _SHARED_ADAPTER)
+_SHARED_SESSION.mount("http://", _SHARED_ADAPTER)
+
+class CircuitBreaker:
     """
-    Geocode a Boston address using ArcGIS API to get latitude and longitude.
-    
-    Args:
-        address (str): Address string (e.g., "123 Main St, Boston, MA")
-    
-    Returns:
-        dict: Dictionary with coordinates and metadata, or None if geocoding fails
-        {
-            'latitude': float,
-            'longitude': float,
-            'score': float,
-            'address': str,
-            'method': str
-        }
+    Per-host circuit breaker. After `threshold` consecutive failures a host is
+    skipped for `cooldown` seconds instead of costing every lookup a full
+    timeout; each failed probe after that doubles the wait, up to
+    `max_cooldown`. Any success closes the breaker again.
     """
-    # Try multiple geocoding services in order of preference
-    geocoding_methods = [
-        _geocode_with_arcgis_world,
-        _geocode_with_boston_arcgis,
-        _geocode_with_nominatim
-    ]
-    
-    for method in geocoding_methods:
+    def __init__(self, threshold=3, cooldown=30, max_cooldown=300):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.hosts = {}  # host -> (consecutive failures, open until)
+    
+    @contextmanager
+    def guard(self, url):
+        host = urlsplit(url).netloc
+        _, open_until = self.hosts.get(host, (0, 0.0))
+        if time.monotonic() < open_until:
+            raise ConnectionError(f"{host} is failing, skipped for {open_until - time.monotonic():.0f}s")
         try:
-            result = method(address)
-            if result:
-                # Convert to standard format
-                return {
-                    'latitude': result['y'],
-                    'longitude': result['x'],
-                    'score': result['score'],
-                    'address': result['address'],
-                    'method': method.__name__
-                }
+            yield
         except Exception as e:
-            print(f"Geocoding attempt failed with {method.__name__}: {e}")
-            continue
-    
-    return None
+            if _host_responded(e):
+                self.hosts.pop(host, None)
+            else:
+                # Re-read the count: other requests to this host may have
+                # failed while this one was in flight
+                failures, open_until = self.hosts.get(host, (0, 0.0))
+                failures += 1
+                if failures >= self.threshold:
+                    wait = min(self.cooldown * 2 ** (failures - self.threshold), self.max_cooldown)
+                    open_until = time.monotonic() + wait
+                    logger.warning("%s failed %d times in a row, skipping it for %ds", host, failures, wait)
+                self.hosts[host] = (failures, open_until)
+            raise
+        else:
+            self.hosts.pop(host, None)
+
+def _host_responded(error):
+    """A 4xx means the host is up and rejected this request, which shouldn't trip the breaker"""
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        return error.response.status_code < 500
+    if isinstance(error, aiohttp.ClientResponseError):
+        return error.status < 500
+    return False
 
-def _geocode_with_arcgis_world(address):
+HOST_BREAKER = CircuitBreaker()
+
+class RateLimiter:
     """
-    Use ArcGIS World Geocoding Service (requires no API key for basic usage)
+    Async context manager spacing calls to one host at least 1/rate seconds
+    apart, with no wait while under quota. A slot is only claimed once a
+    caller is about to send, so a request cancelled while waiting (e.g. a
+    geocoder that lost the race) doesn't push back everyone behind it.
     """
-    geocode_url = "https://geocode-api.arcgis.com/arcgis/rest/services/World/GeocodeServer/findAddressCandidates"
-    
-    params = {
-        'SingleLine': f"{address}",
-        'f': 'json',
-        'outSR': '4326',
-        'maxLocations': 1,
-        'category': 'Address',
-        'countryCode': 'USA'
-    }
+    def __init__(self, rate):
+        self.interval = 1.0 / rate
+        self._next_slot = 0.0
     
-    response = requests.get(geocode_url, params=params, timeout=10)
-    response.raise_for_status()
-    
-    data = response.json()
+    async def __aenter__(self):
+        while True:
+            now = time.monotonic()
+            if now >= self._next_slot:
+                self._next_slot = now + self.interval
+                return
+            await asyncio.sleep(self._next_slot - now)
     
+    async def __aexit__(self, *exc):
+        return False
+
+# Static parts of each geocoder request; only the address changes per call
+ARCGIS_WORLD_URL = "https://geocode-api.arcgis.com/arcgis/rest/services/World/GeocodeServer/findAddressCandidates"
+ARCGIS_WORLD_PARAMS = {
+    'f': 'json',
+    'outSR': '4326',
+    'maxLocations': 1,
+    'category': 'Address',
+    'countryCode': 'USA'
+}
+
+BOSTON_ARCGIS_URL = "https://services.arcgis.com/sFnw0xNflSi8J0qw/arcgis/rest/services/Boston_Composite_Locator/GeocodeServer/findAddressCandidates"
+BOSTON_ARCGIS_PARAMS = {
+    'f': 'json',
+    'outSR': '4326',
+    'maxLocations': 1
+}
+
+NOMINATIM_URL = "https://nominatim.openstreetmap.org/search"
+NOMINATIM_PARAMS = {
+    'format': 'json',
+    'limit': 1,
+    'countrycodes': 'us',
+    'bounded': 1,
+    'viewbox': '-71.191155,42.227925,-70.986365,42.400819'  # Boston area bounding box
+}
+# Add a custom user agent as required by Nominatim
+NOMINATIM_HEADERS = {'User-Agent': 'BostonZoningTool/1.0'}
+
+def _loads(response):
+    return orjson.loads(response.content)
+
+def _parse_arcgis_candidates(data):
     if data.get('candidates') and len(data['candidates']) > 0:
         candidate = data['candidates'][0]
         location = candidate['location']
@@ -77,323 +138,510 @@ def _geocode_with_arcgis_world(address):
         }
     return None
 
-def _geocode_with_boston_arcgis(address):
+def _parse_nominatim(data):
+    if data and len(data) > 0:
+        result = data[0]
+        return {
+            'x': float(result['lon']),
+            'y': float(result['lat']),
+            'score': 100,  # Nominatim doesn't provide scores
+            'address': result['display_name']
+        }
+    return None
+
+# Nominatim's usage policy allows at most 1 request/second, which bulk lookups would exceed
+GEOCODER_LIMITERS = {"nominatim": RateLimiter(1)}
+
+# Geocoding providers in order of preference:
+# (name, url, base params, address param, extra headers, parser, timeout in seconds)
+GEOCODERS = (
+    ("arcgis_world", ARCGIS_WORLD_URL, ARCGIS_WORLD_PARAMS, 'SingleLine', None, _parse_arcgis_candidates, 5),
+    ("boston_arcgis", BOSTON_ARCGIS_URL, BOSTON_ARCGIS_PARAMS, 'SingleLine', None, _parse_arcgis_candidates, 5),
+    ("nominatim", NOMINATIM_URL, NOMINATIM_PARAMS, 'q', NOMINATIM_HEADERS, _parse_nominatim, 5),
+)
+# The two ArcGIS services answer almost every Boston query, so the async path
+# races only those; the public Nominatim server (1 req/s policy) is a fallback
+# for when both come back empty
+RACED_GEOCODERS = GEOCODERS[:2]
+FALLBACK_GEOCODERS = GEOCODERS[2:]
+
+def _try_geocoder(geocoder, address):
+    name, url, base_params, address_param, headers, parse, timeout = geocoder
+    with HOST_BREAKER.guard(url):
+        response = _SHARED_SESSION.get(url, params={**base_params, address_param: address},
+                                       headers=headers, timeout=timeout)
+        response.raise_for_status()
+    return parse(_loads(response))
+
+def _geocode_in_order(address):
+    """Try each geocoding service in order of preference; (name, result) of the first match"""
+    for geocoder in GEOCODERS:
+        name = geocoder[0]
+        try:
+            result = _try_geocoder(geocoder, address)
+            if result:
+                return name, result
+        except Exception as e:
+            logger.warning("Geocoding attempt failed with %s: %s", name, e)
+    return None, None
+
+# Geocodes and zoning-by-point are effectively immutable, so they're cached in
+# memory and on disk (shared across runs) under PLOTTWIST_CACHE_DIR
+CACHE_DIR = os.environ.get("PLOTTWIST_CACHE_DIR", os.path.expanduser("~/.cache/plottwist"))
+
+STREET_ABBREVIATIONS = {
+    'st': 'street', 'ave': 'avenue', 'av': 'avenue', 'rd': 'road', 'blvd': 'boulevard',
+    'dr': 'drive', 'ln': 'lane', 'pl': 'place', 'ct': 'court', 'ter': 'terrace',
+    'sq': 'square', 'pkwy': 'parkway', 'hwy': 'highway', 'cir': 'circle',
+}
+STREET_TYPES = set(STREET_ABBREVIATIONS) | set(STREET_ABBREVIATIONS.values())
+DIRECTION_ABBREVIATIONS = {'n': 'north', 's': 'south', 'e': 'east', 'w': 'west'}
+
+def normalize_address_key(address):
     """
-    Try Boston's ArcGIS Online services
+    Cache key for an address: lower-cased, punctuation stripped, whitespace
+    collapsed and common abbreviations spelled out ("N Harvard St" ->
+    "north harvard street"). A direction letter is only spelled out before
+    a street name, since South Boston's lettered streets ("E St", "N St")
+    are not East or North Street.
     """
-    # Try Boston's main ArcGIS server
-    geocode_url = "https://services.arcgis.com/sFnw0xNflSi8J0qw/arcgis/rest/services/Boston_Composite_Locator/GeocodeServer/findAddressCandidates"
-    
-    params = {
-        'SingleLine': address,
-        'f': 'json',
-        'outSR': '4326',
-        'maxLocations': 1
-    }
+    words = re.sub(r"[^\w\s]", " ", address.lower()).split()
+    key = []
+    for i, word in enumerate(words):
+        if word in DIRECTION_ABBREVIATIONS:
+            following = words[i + 1] if i + 1 < len(words) else None
+            if following and not following.isdigit() and following not in STREET_TYPES:
+                word = DIRECTION_ABBREVIATIONS[word]
+        else:
+            word = STREET_ABBREVIATIONS.get(word, word)
+        key.append(word)
+    return " ".join(key)
+
+def point_key(x, y):
+    """Cache key for a point, rounded to 6 decimals (~10 cm) so geocode jitter still hits"""
+    return f"{x:.6f},{y:.6f}"
+
+class ResultCache:
+    """
+    Two-level cache: an in-process LRU in front of a shelve file on disk.
+    Entries are stored as (value, timestamp) so a TTL can be added later.
+    Disk errors only cost the disk layer, never the lookup. The async
+    methods do the disk I/O on a worker thread so the event loop isn't
+    blocked by it.
+    """
+    def __init__(self, name, maxsize=4096):
+        self.path = os.path.join(CACHE_DIR, name)
+        self.maxsize = maxsize
+        self.memory = OrderedDict()
+        self._disk_lock = threading.Lock()  # one shelve open at a time
     
-    response = requests.get(geocode_url, params=params, timeout=10)
-    response.raise_for_status()
+    def get(self, key):
+        if key in self.memory:
+            self.memory.move_to_end(key)
+            return self.memory[key][0]
+        return self._remember_read(key, self._read(key))
     
-    data = response.json()
+    async def get_async(self, key):
+        if key in self.memory:
+            self.memory.move_to_end(key)
+            return self.memory[key][0]
+        return self._remember_read(key, await asyncio.to_thread(self._read, key))
     
-    if data.get('candidates') and len(data['candidates']) > 0:
-        candidate = data['candidates'][0]
-        location = candidate['location']
-        return {
-            'x': location['x'],
-            'y': location['y'],
-            'score': candidate['score'],
-            'address': candidate['address']
-        }
-    return None
+    def set(self, key, value):
+        entry = (value, time.time())
+        self._remember(key, entry)
+        self._write(key, entry)
+    
+    async def set_async(self, key, value):
+        entry = (value, time.time())
+        self._remember(key, entry)
+        await asyncio.to_thread(self._write, key, entry)
+    
+    def _read(self, key):
+        try:
+            with self._disk_lock, shelve.open(self.path, flag='r') as db:
+                return db.get(key)
+        except Exception:
+            return None
+    
+    def _write(self, key, entry):
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            with self._disk_lock, shelve.open(self.path) as db:
+                db[key] = entry
+        except Exception as e:
+            logger.warning("Could not write %r to %s: %s", key, self.path, e)
+    
+    def _remember_read(self, key, entry):
+        if entry is None:
+            return None
+        self._remember(key, entry)
+        return entry[0]
+    
+    def _remember(self, key, entry):
+        self.memory[key] = entry
+        self.memory.move_to_end(key)
+        if len(self.memory) > self.maxsize:
+            self.memory.popitem(last=False)
+
+# "-v2": keys written before lettered streets were kept apart could hold
+# E St's coordinates under East Street's key
+GEOCODE_CACHE = ResultCache("geocode-v2")
+ZONING_CACHE = ResultCache("zoning")
 
-def _geocode_with_nominatim(address):
+def _geocode_cached(address):
     """
-    Use OpenStreetMap Nominatim geocoding service as fallback
+    Raw geocoder result for `address` ({'x', 'y', 'score', 'address', 'method'}),
+    from GEOCODE_CACHE or else the geocoders in order; None if none matches
     """
-    geocode_url = "https://nominatim.openstreetmap.org/search"
-    
-    params = {
-        'q': f"{address}",
-        'format': 'json',
-        'limit': 1,
-        'countrycodes': 'us',
-        'bounded': 1,
-        'viewbox': '-71.191155,42.227925,-70.986365,42.400819'  # Boston area bounding box
-    }
-    
-    # Add a custom user agent as required by Nominatim
-    headers = {
-        'User-Agent': 'BostonZoningTool/1.0'
-    }
+    key = normalize_address_key(address)
+    cached = GEOCODE_CACHE.get(key)
+    if cached is not None:
+        return dict(cached)
     
-    response = requests.get(geocode_url, params=params, headers=headers, timeout=10)
-    response.raise_for_status()
+    name, result = _geocode_in_order(address)
+    if not result:
+        return None
+    logger.debug("Successfully geocoded with %s", name)
+    result = {**result, 'method': name}
+    GEOCODE_CACHE.set(key, result)
+    return dict(result)
+
+def geocode_boston_address(address):
+    """
+    Geocode a Boston address using ArcGIS API to get latitude and longitude.
     
-    data = response.json()
+    Args:
+        address (str): Address string (e.g., "123 Main St, Boston, MA")
     
-    if data and len(data) > 0:
-        result = data[0]
-        return {
-            'x': float(result['lon']),
-            'y': float(result['lat']),
-            'score': 100,  # Nominatim doesn't provide scores
-            'address': result['display_name']
+    Returns:
+        dict: Dictionary with coordinates and metadata, or None if geocoding fails
+        {
+            'latitude': float,
+            'longitude': float,
+            'score': float,
+            'address': str,
+            'method': str
         }
-    return None
+    """
+    result = _geocode_cached(address)
+    if not result:
+        return None
+    
+    # Convert to standard format
+    return {
+        'latitude': result['y'],
+        'longitude': result['x'],
+        'score': result['score'],
+        'address': result['address'],
+        'method': result.get('method', 'unknown')
+    }
+
+async def first_result(tasks):
+    """
+    Race geocoder tasks ({task: provider name}): return (name, result) for the
+    first one to produce a truthy result, cancelling the rest.
+    """
+    pending = set(tasks)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            # Look at every finished task before returning so no failure goes unretrieved
+            winner = None
+            for task in done:
+                if task.cancelled():
+                    continue
+                if task.exception():
+                    logger.warning("Geocoding attempt failed with %s: %s", tasks[task], task.exception())
+                elif task.result() and winner is None:
+                    winner = task
+            if winner:
+                return tasks[winner], winner.result()
+        return None, None
+    finally:
+        # Cancel the geocoders still in flight so their connections go back to the pool
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+MUNICODE_BASE_URL = "https://library.municode.com/ma/boston/codes/code_of_ordinances"
+
+# Zoning code prefix -> municode section. Every code in a family shares one
+# section, so a single anchored regex picks the family in one match
+_MUNICODE_RE = re.compile(r'(?P<residential>R-[1-6])|(?P<business>B-[1-3])|(?P<mixed_use>MU)|(?P<industrial>I-[12])')
+_MUNICODE_SECTIONS = {
+    'residential': '?nodeId=TIT6ZOCO_CH66ZO_ART66-2ZODI_66-2REDI',
+    'business': '?nodeId=TIT6ZOCO_CH66ZO_ART66-3BUDI',
+    'mixed_use': '?nodeId=TIT6ZOCO_CH66ZO_ART66-4MIUSDI',
+    'industrial': '?nodeId=TIT6ZOCO_CH66ZO_ART66-5INDI',
+}
+
+# Set headers to mimic a browser
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'application/json, text/plain, */*',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Referer': 'https://maps.bostonplans.org/zoningviewer/',
+}
+
+ZONING_SUBDISTRICTS_URL = "https://services.arcgis.com/sFnw0xNflSi8J0qw/arcgis/rest/services/Boston_Zoning_Subdistricts/FeatureServer/0/query"
+ZONING_DISTRICTS_URL = "https://services.arcgis.com/sFnw0xNflSi8J0qw/arcgis/rest/services/Boston_Zoning_Districts/FeatureServer/0/query"
+PARCEL_ZONING_URL = "https://gisdata.boston.gov/server/rest/services/OpenData/Property_Assessment/MapServer/0/query"
+
+# Static part of every zoning point query; only the geometry and fields change
+ZONING_QUERY_PARAMS = {
+    'geometryType': 'esriGeometryPoint',
+    'inSR': '4326',
+    'spatialRel': 'esriSpatialRelIntersects',
+    'returnGeometry': 'false',
+    'f': 'json'
+}
+
+# Only the attributes the zoning queries read (debug mode still asks for '*')
+SUBDISTRICT_OUT_FIELDS = 'zoning,zoning_sub,ZONING,ZONING_SUBDISTRICT,ZONING_DISTRICT,SUBDISTRICT,DISTRICT,ZONE,OVERLAY,OVERLAY_ZONE'
+DISTRICT_OUT_FIELDS = 'zoning,ZONE_CLASS,ZONING,ZONE,DISTRICT'
+PARCEL_ZONING_OUT_FIELDS = 'ZONING,ZONE_CLASS,DISTRICT'
+
+# Layers that rejected their outFields list (it names a field they don't
+# have); later queries to them ask for '*' straight away
+_NEEDS_ALL_FIELDS = set()
+
+def _parse_subdistrict(attributes):
+    """Boston Open Data zoning subdistricts layer"""
+    return {
+        'zoning_code': attributes.get('zoning_sub') or attributes.get('ZONING_SUBDISTRICT') or attributes.get('ZONING') or attributes.get('ZONE') or 'Not found',
+        'district': attributes.get('zoning') or attributes.get('ZONING_DISTRICT') or attributes.get('DISTRICT') or 'Not found',
+        'subdistrict': attributes.get('zoning_sub') or attributes.get('ZONING_SUBDISTRICT') or attributes.get('SUBDISTRICT') or 'Not found',
+        'overlay': attributes.get('OVERLAY') or attributes.get('OVERLAY_ZONE') or 'None',
+    }
+
+def _parse_district(attributes):
+    """Zoning districts layer, for points the subdistricts layer misses"""
+    return {
+        'zoning_code': attributes.get('zoning') or attributes.get('ZONE_CLASS') or attributes.get('ZONING') or attributes.get('ZONE') or 'Not found',
+        'district': attributes.get('zoning') or attributes.get('ZONE_CLASS') or attributes.get('DISTRICT') or 'Not found',
+        'subdistrict': attributes.get('zoning') or attributes.get('ZONE_CLASS') or 'Not found',
+        'overlay': 'None',
+    }
+
+def _parse_parcel_zoning(attributes):
+    """Property assessment parcels on Boston's own GIS server"""
+    return {
+        'zoning_code': attributes.get('ZONING') or attributes.get('ZONE_CLASS') or 'Not found',
+        'district': attributes.get('ZONING') or attributes.get('ZONE_CLASS') or 'Not found',
+        'subdistrict': attributes.get('ZONING') or attributes.get('ZONE_CLASS') or 'Not found',
+        'overlay': 'None',
+    }
+
+# Zoning layers in order of preference: (name, url, outFields, attribute parser)
+ZONERS = (
+    ("subdistricts", ZONING_SUBDISTRICTS_URL, SUBDISTRICT_OUT_FIELDS, _parse_subdistrict),
+    ("districts", ZONING_DISTRICTS_URL, DISTRICT_OUT_FIELDS, _parse_district),
+    ("parcel_zoning", PARCEL_ZONING_URL, PARCEL_ZONING_OUT_FIELDS, _parse_parcel_zoning),
+)
 
 class BostonZoningScraper:
     def __init__(self):
         self.base_url = "https://maps.bostonplans.org"
-        self.session = requests.Session()
-        # Set headers to mimic a browser
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'application/json, text/plain, */*',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Referer': 'https://maps.bostonplans.org/zoningviewer/',
-        })
+        self.headers = HEADERS
+        # Shared with the module-level geocoders, so the browser headers are
+        # passed per request rather than set on the session
+        self.session = _SHARED_SESSION
+        # Raw endpoint JSON by (url, x, y) for the current get_address_zoning call
+        self._zoning_cache = {}
     
-    def geocode_address(self, address):
+    def _new_async_session(self):
         """
-        Convert address to coordinates using multiple geocoding services
+        One session per lookup or bulk run, passed down to every helper: the
+        connector keeps connections to the geocoder and GIS hosts alive and
+        caches their DNS between addresses
         """
-        # Try multiple geocoding services in order of preference
-        geocoding_methods = [
-            self._geocode_with_arcgis_world,
-            self._geocode_with_nominatim,
-            self._geocode_with_boston_arcgis
-        ]
-        
-        for method in geocoding_methods:
-            try:
-                result = method(address)
-                if result:
-                    print(f"Successfully geocoded with {method.__name__}")
-                    return result
-            except Exception as e:
-                print(f"Geocoding attempt failed with {method.__name__}: {e}")
-                continue
-        
-        return None
+        return aiohttp.ClientSession(
+            headers=self.headers,
+            timeout=aiohttp.ClientTimeout(total=10),
+            connector=aiohttp.TCPConnector(limit=32, limit_per_host=8, ttl_dns_cache=300),
+        )
     
-    def _geocode_with_arcgis_world(self, address):
+    def geocode_address(self, address):
         """
-        Use ArcGIS World Geocoding Service (requires no API key for basic usage)
+        Convert address to coordinates using multiple geocoding services,
+        tried in order over the shared requests session. Results are cached
+        by normalized address.
         """
-        geocode_url = "https://geocode-api.arcgis.com/arcgis/rest/services/World/GeocodeServer/findAddressCandidates"
-        
-        params = {
-            'SingleLine': f"{address}",
-            'f': 'json',
-            'outSR': '4326',
-            'maxLocations': 1,
-            'category': 'Address',
-            'countryCode': 'USA'
-        }
-        
-        response = self.session.get(geocode_url, params=params, timeout=10)
-        response.raise_for_status()
-        
-        data = response.json()
-        
-        if data.get('candidates') and len(data['candidates']) > 0:
-            candidate = data['candidates'][0]
-            location = candidate['location']
-            return {
-                'x': location['x'],
-                'y': location['y'],
-                'score': candidate['score'],
-                'address': candidate['address']
-            }
-        return None
+        return _geocode_cached(address)
     
-    def _geocode_with_nominatim(self, address):
+    async def geocode_address_async(self, address, session=None):
         """
-        Use OpenStreetMap Nominatim geocoding service
+        Query both ArcGIS services at once and return the first match, so a
+        slow or failing provider doesn't add its timeout to the lookup;
+        Nominatim is only asked if neither finds the address. Results are
+        cached by normalized address.
         """
-        geocode_url = "https://nominatim.openstreetmap.org/search"
-        
-        params = {
-            'q': f"{address}",
-            'format': 'json',
-            'limit': 1,
-            'countrycodes': 'us',
-            'bounded': 1,
-            'viewbox': '-71.191155,42.227925,-70.986365,42.400819'  # Boston area bounding box
-        }
-        
-        # Add a custom user agent as required by Nominatim
-        headers = self.session.headers.copy()
-        headers['User-Agent'] = 'BostonZoningTool/1.0'
-        
-        response = self.session.get(geocode_url, params=params, headers=headers, timeout=10)
-        response.raise_for_status()
-        
-        data = response.json()
-        
-        if data and len(data) > 0:
-            result = data[0]
-            return {
-                'x': float(result['lon']),
-                'y': float(result['lat']),
-                'score': 100,  # Nominatim doesn't provide scores
-                'address': result['display_name']
-            }
-        return None
+        key = normalize_address_key(address)
+        cached = await GEOCODE_CACHE.get_async(key)
+        if cached is not None:
+            return dict(cached)
+        
+        if session is None:
+            async with self._new_async_session() as session:
+                result = await self._geocode_uncached(session, address)
+        else:
+            result = await self._geocode_uncached(session, address)
+        
+        if result:
+            await GEOCODE_CACHE.set_async(key, result)
+        return result
     
-    def _geocode_with_boston_arcgis(self, address):
-        """
-        Try Boston's ArcGIS Online services
-        """
-        # Try Boston's main ArcGIS server
-        geocode_url = "https://services.arcgis.com/sFnw0xNflSi8J0qw/arcgis/rest/services/Boston_Composite_Locator/GeocodeServer/findAddressCandidates"
-        
-        params = {
-            'SingleLine': address,
-            'f': 'json',
-            'outSR': '4326',
-            'maxLocations': 1
-        }
-        
-        response = self.session.get(geocode_url, params=params, timeout=10)
-        response.raise_for_status()
-        
-        data = response.json()
+    async def _geocode_uncached(self, session, address):
+        tasks = {asyncio.create_task(self._try_geocoder_async(session, geocoder, address)): geocoder[0]
+                 for geocoder in RACED_GEOCODERS}
         
-        if data.get('candidates') and len(data['candidates']) > 0:
-            candidate = data['candidates'][0]
-            location = candidate['location']
-            return {
-                'x': location['x'],
-                'y': location['y'],
-                'score': candidate['score'],
-                'address': candidate['address']
-            }
-        return None
+        name, result = await first_result(tasks)
+        for geocoder in FALLBACK_GEOCODERS:
+            if result:
+                break
+            name = geocoder[0]
+            try:
+                result = await self._try_geocoder_async(session, geocoder, address)
+            except Exception as e:
+                logger.warning("Geocoding attempt failed with %s: %s", name, e)
+        if not result:
+            return None
+        logger.debug("Successfully geocoded with %s", name)
+        return {**result, 'method': name}
+    
+    async def _try_geocoder_async(self, session, geocoder, address):
+        name, url, base_params, address_param, headers, parse, timeout = geocoder
+        async with GEOCODER_LIMITERS.get(name, nullcontext()):
+            with HOST_BREAKER.guard(url):
+                async with session.get(url, params={**base_params, address_param: address}, headers=headers,
+                                       timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                    response.raise_for_status()
+                    return parse(orjson.loads(await response.read()))
     
     def get_zoning_info(self, x, y):
         """
-        Query the zoning layer using coordinates - try multiple endpoints
+        Query the zoning layer using coordinates - try multiple endpoints,
+        in order of preference, over the shared requests session. Results
+        are cached by rounded point.
         """
-        zoning_methods = [
-            self._query_boston_zoning_primary,
-            self._query_boston_zoning_secondary,
-            self._query_boston_zoning_legacy
-        ]
+        key = point_key(x, y)
+        cached = ZONING_CACHE.get(key)
+        if cached is not None:
+            return dict(cached)
         
-        for method in zoning_methods:
+        for zoner in ZONERS:
+            name = zoner[0]
             try:
-                result = method(x, y)
-                if result:
-                    print(f"Successfully found zoning info with {method.__name__}")
-                    return result
+                result = self._try_zoner(zoner, x, y)
             except Exception as e:
-                print(f"Zoning query attempt failed with {method.__name__}: {e}")
+                logger.warning("Zoning query attempt failed with %s: %s", name, e)
                 continue
-        
+            if result:
+                logger.debug("Successfully found zoning info with %s", name)
+                ZONING_CACHE.set(key, result)
+                return result
         return None
     
-    def _query_boston_zoning_primary(self, x, y):
+    async def get_zoning_info_async(self, x, y, session=None):
         """
-        Query the primary Boston zoning service - Boston Open Data
+        Query all zoning endpoints at once, but keep their order of preference:
+        the first endpoint (in list order) with a result wins, and the rest are
+        cancelled as soon as that's known. Results are cached by rounded point.
         """
-        # Boston Open Data ArcGIS service endpoint
-        zoning_url = "https://services.arcgis.com/sFnw0xNflSi8J0qw/arcgis/rest/services/Boston_Zoning_Subdistricts/FeatureServer/0/query"
-        
-        params = {
-            'geometry': f'{x},{y}',
-            'geometryType': 'esriGeometryPoint',
-            'inSR': '4326',
-            'spatialRel': 'esriSpatialRelIntersects',
-            'outFields': '*',
-            'returnGeometry': 'false',
-            'f': 'json'
-        }
-        
-        response = self.session.get(zoning_url, params=params, timeout=10)
-        response.raise_for_status()
-        
-        data = response.json()
+        key = point_key(x, y)
+        cached = await ZONING_CACHE.get_async(key)
+        if cached is not None:
+            return dict(cached)
+        
+        if session is None:
+            async with self._new_async_session() as session:
+                result = await self._zoning_info_uncached(session, x, y)
+        else:
+            result = await self._zoning_info_uncached(session, x, y)
+        
+        if result:
+            await ZONING_CACHE.set_async(key, result)
+        return result
+    
+    async def _zoning_info_uncached(self, session, x, y):
+        tasks = [asyncio.create_task(self._try_zoner_async(session, zoner, x, y)) for zoner in ZONERS]
         
-        if data.get('features') and len(data['features']) > 0:
-            feature = data['features'][0]
-            attributes = feature['attributes']
-            
-            return {
-                'zoning_code': attributes.get('zoning_sub') or attributes.get('ZONING_SUBDISTRICT') or attributes.get('ZONING') or attributes.get('ZONE') or 'Not found',
-                'district': attributes.get('zoning') or attributes.get('ZONING_DISTRICT') or attributes.get('DISTRICT') or 'Not found',
-                'subdistrict': attributes.get('zoning_sub') or attributes.get('ZONING_SUBDISTRICT') or attributes.get('SUBDISTRICT') or 'Not found',
-                'overlay': attributes.get('OVERLAY') or attributes.get('OVERLAY_ZONE') or 'None',
-            }
-        return None
+        try:
+            for (name, *_), task in zip(ZONERS, tasks):
+                try:
+                    result = await task
+                except Exception as e:
+                    logger.warning("Zoning query attempt failed with %s: %s", name, e)
+                    continue
+                if result:
+                    logger.debug("Successfully found zoning info with %s", name)
+                    return result
+            return None
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+    
+    @staticmethod
+    def _zoning_params(x, y, out_fields='*'):
+        return {**ZONING_QUERY_PARAMS, 'geometry': f'{x},{y}', 'outFields': out_fields}
     
-    def _query_boston_zoning_secondary(self, x, y):
+    def _fetch_zoning_json(self, url, x, y, out_fields='*'):
         """
-        Try alternative Boston zoning service endpoint - Districts
+        Point query `url`. Queries for every field are remembered in
+        self._zoning_cache so the zoning lookup that follows debug mode
+        doesn't query the same endpoint again
         """
-        # Try the zoning districts service instead of subdistricts
-        zoning_url = "https://services.arcgis.com/sFnw0xNflSi8J0qw/arcgis/rest/services/Boston_Zoning_Districts/FeatureServer/0/query"
-        
-        params = {
-            'geometry': f'{x},{y}',
-            'geometryType': 'esriGeometryPoint',
-            'inSR': '4326',
-            'spatialRel': 'esriSpatialRelIntersects',
-            'outFields': '*',
-            'returnGeometry': 'false',
-            'f': 'json'
-        }
-        
-        response = self.session.get(zoning_url, params=params, timeout=10)
-        response.raise_for_status()
-        
-        data = response.json()
-        
+        key = (url, round(x, 6), round(y, 6))
+        if key in self._zoning_cache:
+            return self._zoning_cache[key]
+        if url in _NEEDS_ALL_FIELDS:
+            out_fields = '*'
+        with HOST_BREAKER.guard(url):
+            response = self.session.get(url, params=self._zoning_params(x, y, out_fields), headers=self.headers, timeout=10)
+            response.raise_for_status()
+        logger.debug("Response status: %s", response.status_code)
+        data = _loads(response)
+        # A layer that lacks one of the requested fields rejects the whole query
+        if 'error' in data and out_fields != '*':
+            logger.debug("%s rejected outFields %s, asking it for '*' from now on", url, out_fields)
+            _NEEDS_ALL_FIELDS.add(url)
+            return self._fetch_zoning_json(url, x, y)
+        if out_fields == '*':
+            self._zoning_cache[key] = data
+        return data
+    
+    async def _fetch_zoning_json_async(self, session, url, x, y, out_fields='*'):
+        """Point query `url`, reusing the JSON debug mode already fetched for this point"""
+        cached = self._zoning_cache.get((url, round(x, 6), round(y, 6)))
+        if cached is not None:
+            return cached
+        if url in _NEEDS_ALL_FIELDS:
+            out_fields = '*'
+        with HOST_BREAKER.guard(url):
+            async with session.post(url, data=self._zoning_params(x, y, out_fields)) as response:
+                response.raise_for_status()
+                data = orjson.loads(await response.read())
+        # A layer that lacks one of the requested fields rejects the whole query
+        if 'error' in data and out_fields != '*':
+            logger.debug("%s rejected outFields %s, asking it for '*' from now on", url, out_fields)
+            _NEEDS_ALL_FIELDS.add(url)
+            return await self._fetch_zoning_json_async(session, url, x, y)
+        return data
+    
+    def _try_zoner(self, zoner, x, y):
+        name, url, out_fields, parse = zoner
+        data = self._fetch_zoning_json(url, x, y, out_fields=out_fields)
         if data.get('features') and len(data['features']) > 0:
-            feature = data['features'][0]
-            attributes = feature['attributes']
-            
-            return {
-                'zoning_code': attributes.get('zoning') or attributes.get('ZONE_CLASS') or attributes.get('ZONING') or attributes.get('ZONE') or 'Not found',
-                'district': attributes.get('zoning') or attributes.get('ZONE_CLASS') or attributes.get('DISTRICT') or 'Not found',
-                'subdistrict': attributes.get('zoning') or attributes.get('ZONE_CLASS') or 'Not found',
-                'overlay': 'None',
-            }
+            return parse(data['features'][0]['attributes'])
         return None
     
-    def _query_boston_zoning_legacy(self, x, y):
-        """
-        Try Boston Open Data REST API directly
-        """
-        # Use the direct REST service for Boston Open Data
-        zoning_url = "https://gisdata.boston.gov/server/rest/services/OpenData/Property_Assessment/MapServer/0/query"
-        
-        params = {
-            'geometry': f'{x},{y}',
-            'geometryType': 'esriGeometryPoint',
-            'inSR': '4326',
-            'spatialRel': 'esriSpatialRelIntersects',
-            'outFields': 'ZONING,ZONE_CLASS,DISTRICT',
-            'returnGeometry': 'false',
-            'f': 'json'
-        }
-        
-        response = self.session.get(zoning_url, params=params, timeout=10)
-        response.raise_for_status()
-        
-        data = response.json()
-        
+    async def _try_zoner_async(self, session, zoner, x, y):
+        name, url, out_fields, parse = zoner
+        data = await self._fetch_zoning_json_async(session, url, x, y, out_fields=out_fields)
         if data.get('features') and len(data['features']) > 0:
-            feature = data['features'][0]
-            attributes = feature['attributes']
-            
-            return {
-                'zoning_code': attributes.get('ZONING') or attributes.get('ZONE_CLASS') or 'Not found',
-                'district': attributes.get('ZONING') or attributes.get('ZONE_CLASS') or 'Not found',
-                'subdistrict': attributes.get('ZONING') or attributes.get('ZONE_CLASS') or 'Not found',
-                'overlay': 'None',
-            }
+            return parse(data['features'][0]['attributes'])
         return None
     
     def get_municode_link(self, zoning_code):
@@ -401,96 +649,56 @@ class BostonZoningScraper:
         Generate municode library link based on zoning code
         Boston's zoning code is in Article 66 of the municode library
         """
-        base_municode_url = "https://library.municode.com/ma/boston/codes/code_of_ordinances"
-        
-        # Map common zoning codes to their sections
-        zoning_sections = {
-            # Residential zones
-            'R-1': '?nodeId=TIT6ZOCO_CH66ZO_ART66-2ZODI_66-2REDI',
-            'R-2': '?nodeId=TIT6ZOCO_CH66ZO_ART66-2ZODI_66-2REDI',
-            'R-3': '?nodeId=TIT6ZOCO_CH66ZO_ART66-2ZODI_66-2REDI',
-            'R-4': '?nodeId=TIT6ZOCO_CH66ZO_ART66-2ZODI_66-2REDI',
-            'R-5': '?nodeId=TIT6ZOCO_CH66ZO_ART66-2ZODI_66-2REDI',
-            'R-6': '?nodeId=TIT6ZOCO_CH66ZO_ART66-2ZODI_66-2REDI',
-            
-            # Commercial zones
-            'B-1': '?nodeId=TIT6ZOCO_CH66ZO_ART66-3BUDI',
-            'B-2': '?nodeId=TIT6ZOCO_CH66ZO_ART66-3BUDI',
-            'B-3': '?nodeId=TIT6ZOCO_CH66ZO_ART66-3BUDI',
-            
-            # Mixed use
-            'MU': '?nodeId=TIT6ZOCO_CH66ZO_ART66-4MIUSDI',
-            
-            # Industrial
-            'I-1': '?nodeId=TIT6ZOCO_CH66ZO_ART66-5INDI',
-            'I-2': '?nodeId=TIT6ZOCO_CH66ZO_ART66-5INDI',
-        }
-        
-        # Try to match the zoning code
-        for code, section in zoning_sections.items():
-            if zoning_code.startswith(code):
-                return base_municode_url + section
+        m = _MUNICODE_RE.match(zoning_code)
+        if m:
+            return MUNICODE_BASE_URL + _MUNICODE_SECTIONS[m.lastgroup]
         
         # Default to main zoning chapter if no specific match
-        return base_municode_url + "?nodeId=TIT6ZOCO_CH66ZO"
+        return MUNICODE_BASE_URL + "?nodeId=TIT6ZOCO_CH66ZO"
     
     def debug_zoning_fields(self, x, y):
         """
         Debug method to see what fields are available in the zoning services
         """
-        print("=== DEBUGGING ZONING FIELDS ===")
+        logger.debug("=== DEBUGGING ZONING FIELDS ===")
         
         endpoints = [
-            ("Primary (Subdistricts)", "https://services.arcgis.com/sFnw0xNflSi8J0qw/arcgis/rest/services/Boston_Zoning_Subdistricts/FeatureServer/0/query"),
-            ("Secondary (Districts)", "https://services.arcgis.com/sFnw0xNflSi8J0qw/arcgis/rest/services/Boston_Zoning_Districts/FeatureServer/0/query"),
-            ("Legacy (GIS Data)", "https://gisdata.boston.gov/server/rest/services/OpenData/Property_Assessment/MapServer/0/query"),
+            ("Primary (Subdistricts)", ZONING_SUBDISTRICTS_URL),
+            ("Secondary (Districts)", ZONING_DISTRICTS_URL),
+            ("Legacy (GIS Data)", PARCEL_ZONING_URL),
         ]
         
         for name, url in endpoints:
             try:
-                print(f"\nTesting {name}:")
-                print(f"URL: {url}")
+                logger.debug("Testing %s:", name)
+                logger.debug("URL: %s", url)
                 
-                params = {
-                    'geometry': f'{x},{y}',
-                    'geometryType': 'esriGeometryPoint',
-                    'inSR': '4326',
-                    'spatialRel': 'esriSpatialRelIntersects',
-                    'outFields': '*',
-                    'returnGeometry': 'false',
-                    'f': 'json'
-                }
-                
-                response = self.session.get(url, params=params, timeout=10)
-                response.raise_for_status()
-                
-                data = response.json()
-                print(f"Response status: {response.status_code}")
+                data = self._fetch_zoning_json(url, x, y)
                 
                 if 'error' in data:
-                    print(f"API Error: {data['error']}")
+                    logger.debug("API Error: %s", data['error'])
                 elif data.get('features') and len(data['features']) > 0:
                     feature = data['features'][0]
                     attributes = feature['attributes']
-                    print("SUCCESS! Available fields:")
-                    for key, value in attributes.items():
-                        print(f"  {key}: {value}")
+                    logger.debug("SUCCESS! Available fields:\n%s",
+                                 "\n".join(f"  {key}: {value}" for key, value in attributes.items()))
                 else:
-                    print("No features found at this location")
+                    logger.debug("No features found at this location")
                     
             except Exception as e:
-                print(f"Error testing {name}: {e}")
+                logger.debug("Error testing %s: %s", name, e)
         
-        print("=== END DEBUG ===\n")
+        logger.debug("=== END DEBUG ===")
 
     def get_address_zoning(self, address, debug=False):
         """
         Main method to get zoning information for an address
         """
-        print(f"Looking up zoning information for: {address}")
+        self._zoning_cache.clear()
+        logger.info("Looking up zoning information for: %s", address)
         
         # Step 1: Geocode the address
-        print("Geocoding address...")
+        logger.debug("Geocoding address...")
         coordinates = self.geocode_address(address)
         
         if not coordinates:
@@ -499,15 +707,15 @@ class BostonZoningScraper:
                 'address': address
             }
         
-        print(f"Found coordinates: ({coordinates['x']}, {coordinates['y']})")
-        print(f"Matched address: {coordinates['address']}")
+        logger.info("Found coordinates: (%s, %s)", coordinates['x'], coordinates['y'])
+        logger.info("Matched address: %s", coordinates['address'])
         
-        # Debug mode - show all available fields
-        if debug:
+        # Debug mode - show all available fields (only worth the extra queries if the dump will be seen)
+        if debug and logger.isEnabledFor(logging.DEBUG):
             self.debug_zoning_fields(coordinates['x'], coordinates['y'])
         
         # Step 2: Get zoning information
-        print("Querying zoning information...")
+        logger.debug("Querying zoning information...")
         zoning_info = self.get_zoning_info(coordinates['x'], coordinates['y'])
         
         if not zoning_info:
@@ -517,7 +725,36 @@ class BostonZoningScraper:
                 'coordinates': coordinates
             }
         
-        # Step 3: Generate municode link
+        return self._compile_result(coordinates, zoning_info)
+    
+    async def get_address_zoning_async(self, address, session=None):
+        """
+        Async get_address_zoning (without debug mode); pass `session` to share
+        one aiohttp session across many lookups
+        """
+        if session is None:
+            async with self._new_async_session() as session:
+                return await self.get_address_zoning_async(address, session)
+        
+        coordinates = await self.geocode_address_async(address, session)
+        if not coordinates:
+            return {
+                'error': 'Could not find coordinates for the given address',
+                'address': address
+            }
+        
+        zoning_info = await self.get_zoning_info_async(coordinates['x'], coordinates['y'], session)
+        if not zoning_info:
+            return {
+                'error': 'Could not find zoning information for these coordinates',
+                'address': coordinates['address'],
+                'coordinates': coordinates
+            }
+        
+        return self._compile_result(coordinates, zoning_info)
+    
+    def _compile_result(self, coordinates, zoning_info):
+        # Generate municode link
         municode_link = self.get_municode_link(zoning_info['zoning_code'])
         
         # Compile results
@@ -567,5 +804,63 @@ def simple_lookup(address):
     scraper = BostonZoningScraper()
     return scraper.get_address_zoning(address)
 
+async def iter_lookups_async(addresses, concurrency=5):
+    """
+    Look up many addresses at once over one aiohttp session, yielding each
+    result as soon as it and every result before it are ready, so output
+    stays in input order. At most `concurrency` pipelines run together so
+    the public geocoders aren't flooded.
+    """
+    scraper = BostonZoningScraper()
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def lookup(session, address):
+        async with semaphore:
+            try:
+                return await scraper.get_address_zoning_async(address, session)
+            except Exception as e:
+                return {'error': str(e), 'address': address}
+    
+    async with scraper._new_async_session() as session:
+        tasks = [asyncio.create_task(lookup(session, address)) for address in addresses]
+        try:
+            # Awaiting in input order holds back finished results until the
+            # ones before them are written
+            for task in tasks:
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+async def bulk_lookup_async(addresses, concurrency=5):
+    """Look up many addresses concurrently; results come back in input order"""
+    return [result async for result in iter_lookups_async(addresses, concurrency)]
+
+def bulk_lookup(addresses, concurrency=5):
+    return asyncio.run(bulk_lookup_async(addresses, concurrency))
+
+async def _write_lookups_async(addresses, concurrency, out):
+    async for result in iter_lookups_async(addresses, concurrency):
+        out.write(orjson.dumps(result) + b"\n")
+        out.flush()
+
+def lookup_file(path, concurrency=5):
+    """
+    Look up every address in `path` (one per line) concurrently and stream the
+    results to stdout as NDJSON, one JSON object per line in input order,
+    each written as soon as it's ready
+    """
+    with open(path) as f:
+        addresses = [line.strip() for line in f if line.strip()]
+    
+    asyncio.run(_write_lookups_async(addresses, concurrency, sys.stdout.buffer))
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # python zoning_scraper.py addresses.txt [concurrency] > zoning.ndjson
+    if len(sys.argv) > 1:
+        logging.basicConfig(level=logging.WARNING)
+        lookup_file(sys.argv[1], *(int(arg) for arg in sys.argv[2:3]))
+    else:
+        logging.basicConfig(level=logging.DEBUG)
+        main()
\ No newline at end of file
@@ -0,0 +1,41 @@
+import math
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from comparable_developments import haversine_vec, nearest_distances
+
+# 263 N Harvard St, Allston
+LAT0, LON0 = 42.3639, -71.1289
+
+
+class NearestDistancesTest(unittest.TestCase):
+    def test_only_top_k_get_distances(self):
+        lats = np.array([42.3640, 42.3700, 42.4000, 42.3500, 42.3650])
+        lons = np.array([-71.1290, -71.1300, -71.0500, -71.2000, -71.1280])
+        dists = nearest_distances(lats, lons, LAT0, LON0, k=2)
+        exact = haversine_vec(lats, lons, LAT0, LON0)
+        self.assertEqual(np.isfinite(dists).sum(), 2)
+        for i in (0, 4):  # the two closest points
+            self.assertAlmostEqual(dists[i], exact[i])
+        for i in (1, 2, 3):
+            self.assertEqual(dists[i], math.inf)
+
+    def test_nan_coordinates_are_inf(self):
+        lats = np.array([42.3640, np.nan, 42.3700])
+        lons = np.array([-71.1290, -71.1300, np.nan])
+        dists = nearest_distances(lats, lons, LAT0, LON0, k=3)
+        self.assertTrue(np.isfinite(dists[0]))
+        self.assertEqual(dists[1], math.inf)
+        self.assertEqual(dists[2], math.inf)
+
+    def test_empty(self):
+        self.assertEqual(len(nearest_distances(np.array([]), np.array([]), LAT0, LON0, k=5)), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
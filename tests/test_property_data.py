@@ -0,0 +1,116 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from property_data import get_building_value, new_property_data, parse_property_details, _read_search_page
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURES, name), 'rb') as f:
+        return f.read()
+
+
+class ParsePropertyDetailsTest(unittest.TestCase):
+    def setUp(self):
+        parse_property_details.cache_clear()
+
+    def test_details_page(self):
+        details = parse_property_details(load_fixture('details_page.html'))
+        self.assertEqual(details, {
+            'parcel_id': '2201486000',
+            'property_type': 'Two Family',
+            'classification_code': '0104 (Residential Property  / TWO-FAM DWELLING)',
+            'lot_size': '4,905 sq ft',
+            'living_area': '2,193 sq ft',
+            'year_built': '1900',
+            'owner': '263 N HARVARD ST LLC',
+            'owner_address': 'PO BOX 35 BOSTON MA 02134',
+            'fy2025_building_value': '$923,500.00',
+            'fy2025_land_value': '$377,600.00',
+            'fy2025_total_value': '$1,301,100.00',
+            'land_use': '104 - TWO-FAM DWELLING',
+            'building_style': 'Two Family',
+            'stories': '2.5',
+            'total_rooms': '10',
+            'bedrooms': '5',
+            'bathrooms': '2',
+            'number_of_kitchens': '2',
+            'heat_type': 'Forced Hot Air',
+            'ac_type': 'None',
+            'interior_condition': 'Average',
+            'exterior_condition': 'Average',
+            'exterior_finish': 'Vinyl',
+            'foundation': 'Stone',
+            'parking_spaces': '2',
+        })
+
+    def test_skips_rows_without_exactly_two_cells(self):
+        page = (b'<table><tr class="mainCategoryModuleText"><td>Owner on Jan 1:</td><td>X</td><td>extra</td></tr>'
+                b'<tr class="mainCategoryModuleText"><td>Owner on Jan 1:</td><td>ACME LLC</td></tr></table>')
+        self.assertEqual(parse_property_details(page), {'owner': 'ACME LLC'})
+
+    def test_empty_page(self):
+        self.assertEqual(parse_property_details(b''), {})
+
+
+class GetBuildingValueTest(unittest.TestCase):
+    def setUp(self):
+        get_building_value.cache_clear()
+
+    def test_details_page(self):
+        self.assertEqual(get_building_value(load_fixture('details_page.html')), {
+            'FY2025 Building value': '$923500.00',
+            'FY2025 Land value': '$377600.00',
+            'FY2025 Total value': '$1301100.00',
+        })
+
+    def test_total_label_does_not_swallow_next_value(self):
+        page = (b'<p>FY2025 Total (see below)</p><p>FY2025 Building value: $100,000</p>'
+                b'<p>FY2025 Land value: $50,000</p><p>FY2025 Total value: $150,000.00</p>')
+        self.assertEqual(get_building_value(page), {
+            'FY2025 Building value': '$100000',
+            'FY2025 Land value': '$50000',
+            'FY2025 Total value': '$150000.00',
+        })
+
+
+class ReadSearchPageTest(unittest.TestCase):
+    def setUp(self):
+        parse_property_details.cache_clear()
+
+    def test_results_page_follows_details_link(self):
+        property_data = new_property_data('', '263', 'N Harvard', 'St', '')
+        details_urls = _read_search_page(load_fixture('search_results.html'), property_data)
+        self.assertEqual(details_urls, ['https://www.cityofboston.gov/assessing/search/?pid=2201486000'])
+        self.assertEqual(property_data['parcel_id'], '2201486000')
+        self.assertEqual(property_data['fy2025_total_value'], '$1,301,100.00')
+        self.assertEqual(property_data['owner'], '263 N HARVARD ST LLC')
+
+    def test_multiple_results_keep_last_row(self):
+        page = load_fixture('search_results.html').replace(b'</tr>\n</table>\n</body>', (
+            b'</tr>\n<tr><td>2201486002</td><td>263 N HARVARD ST #2</td><td>HARVARD REALTY TRUST</td>'
+            b'<td>$650,200.00</td><td><a href="?pid=2201486002">Details</a></td></tr>\n</table>\n</body>'))
+        property_data = new_property_data('', '263', 'N Harvard', 'St', '')
+        details_urls = _read_search_page(page, property_data)
+        self.assertEqual(len(details_urls), 2)
+        self.assertEqual(property_data['parcel_id'], '2201486002')
+        self.assertEqual(property_data['owner'], 'HARVARD REALTY TRUST')
+        self.assertEqual(property_data['fy2025_total_value'], '$650,200.00')
+
+    def test_parcel_page_skips_details_link(self):
+        # A single-parcel search answered with the parcel's own page, which still links to "Details"
+        page = load_fixture('details_page.html').replace(b'</body>', b'<a href="?pid=2201486000">Details</a></body>')
+        property_data = new_property_data('2201486000', '', '', '', '')
+        details_urls = _read_search_page(page, property_data)
+        self.assertEqual(details_urls, [])
+        self.assertEqual(property_data['property_type'], 'Two Family')
+        self.assertEqual(property_data['year_built'], '1900')
+        self.assertEqual(property_data['lot_size'], '4,905 sq ft')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import asyncio
+import os
+import sys
+import time
+import unittest
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from zoning_scraper import CircuitBreaker, RateLimiter, normalize_address_key
+
+
+class NormalizeAddressKeyTest(unittest.TestCase):
+    def test_abbreviations_spelled_out(self):
+        self.assertEqual(normalize_address_key("263 N. Harvard St, Boston"),
+                         normalize_address_key("263 North Harvard Street Boston"))
+        self.assertEqual(normalize_address_key("263 N Harvard St"), "263 north harvard street")
+
+    def test_lettered_streets_kept_apart(self):
+        self.assertEqual(normalize_address_key("1 N St, Boston"), "1 n street boston")
+        self.assertNotEqual(normalize_address_key("1 N St, Boston"), normalize_address_key("1 North St, Boston"))
+        self.assertNotEqual(normalize_address_key("12 E St"), normalize_address_key("12 East St"))
+        self.assertEqual(normalize_address_key("12 E Street"), normalize_address_key("12 e st"))
+
+
+
+def http_error(status):
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(response=response)
+
+
+class CircuitBreakerTest(unittest.TestCase):
+    URL = 'https://geocoder.example/find'
+
+    def record_failure(self, breaker, error):
+        with self.assertRaises(type(error)):
+            with breaker.guard(self.URL):
+                raise error
+
+    def test_opens_after_threshold_failures(self):
+        breaker = CircuitBreaker(threshold=3, cooldown=30)
+        for _ in range(2):
+            self.record_failure(breaker, ConnectionError('timed out'))
+        with breaker.guard(self.URL):
+            pass  # still closed below the threshold, and a success resets it
+        for _ in range(3):
+            self.record_failure(breaker, ConnectionError('timed out'))
+        with self.assertRaisesRegex(ConnectionError, 'skipped'):
+            with breaker.guard(self.URL):
+                self.fail('guarded block ran while the breaker was open')
+
+    def test_client_error_does_not_trip(self):
+        breaker = CircuitBreaker(threshold=2)
+        for _ in range(5):
+            self.record_failure(breaker, http_error(404))
+        with breaker.guard(self.URL):
+            pass
+        self.assertEqual(breaker.hosts, {})
+
+
+class RateLimiterTest(unittest.TestCase):
+    def test_calls_spaced_by_interval(self):
+        limiter = RateLimiter(20)
+        sent = []
+
+        async def call():
+            async with limiter:
+                sent.append(time.monotonic())
+
+        async def main():
+            await asyncio.gather(*(call() for _ in range(4)))
+
+        asyncio.run(main())
+        gaps = [b - a for a, b in zip(sent, sent[1:])]
+        self.assertEqual(len(gaps), 3)
+        for gap in gaps:
+            self.assertGreaterEqual(gap, limiter.interval)
+
+
+if __name__ == '__main__':
+    unittest.main()